@@ -8,3 +8,6 @@ class ConfigsConfig(AppConfig):
     def ready(self):
         import configs.signals
         importlib.import_module("configs.auth_extension")
+        from django.db.backends.signals import connection_created
+        from configs.metrics import install_query_recorder
+        connection_created.connect(install_query_recorder, dispatch_uid="configs.metrics")
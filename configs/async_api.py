@@ -0,0 +1,51 @@
+from functools import wraps
+from django.contrib.auth.models import AnonymousUser
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from configs.authentication import aauthenticate
+from configs.schema import document
+from configs.utils import json_response, error_body
+
+
+def method_not_allowed(request):
+    return json_response(error_body(f'Method "{request.method}" not allowed.', 405), 405)
+
+
+def async_api_view(methods=("GET",), permission_classes=(), **schema):
+    """Run an async function view behind the same token auth, permission classes and error bodies as the DRF views.
+
+    ``schema`` takes extend_schema arguments for the view's OpenAPI description.
+    """
+    allowed = set(methods) | ({"HEAD"} if "GET" in methods else set())
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in allowed:
+                return method_not_allowed(request)
+
+            # DRF answers authentication failures with 403 when the
+            # authenticator sends no WWW-Authenticate header, as ours does not.
+            try:
+                user = await aauthenticate(request)
+            except exceptions.AuthenticationFailed as exc:
+                return json_response(error_body(exc.detail, 403), 403)
+            request.user = user or AnonymousUser()
+
+            for permission_class in permission_classes:
+                permission = permission_class()
+                if not permission.has_permission(request, None):
+                    if user is None:
+                        message = exceptions.NotAuthenticated.default_detail
+                    else:
+                        message = getattr(permission, "message", exceptions.PermissionDenied.default_detail)
+                    return json_response(error_body(message, 403), 403)
+
+            try:
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return json_response(error_body(exc.detail, exc.status_code), exc.status_code)
+
+        return document(methods, permission_classes, **schema)(csrf_exempt(inner))
+
+    return decorator
@@ -0,0 +1,211 @@
+import uuid
+import orjson
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.request import Request
+from configs.models import User, Role
+from configs.serializers import LoginSerializer, RoleSerializer, role_reader
+from configs.authentication import evict_token
+from configs.passwords import acheck_password, HashPoolSaturated
+from configs.async_api import async_api_view, method_not_allowed
+from configs.pagination import KeysetPagination
+from configs.permissions import UserPermission
+from configs.query_budget import query_budget
+from configs.schema import document
+from configs.utils import json_response, success_body, error_body, async_conditional_get
+from configs.versions import atable_version
+
+# Seconds a client is told to wait when every password check slot is taken
+LOGIN_RETRY_AFTER = 1
+
+
+def read_payload(request):
+    if request.content_type == "application/json":
+        return orjson.loads(request.body or b"{}")
+    return request.POST
+
+
+def parse_error(exc):
+    return json_response(error_body(f"JSON parse error - {exc}", 400), 400)
+
+
+@document(
+    methods=("POST",),
+    operation_id="login_user",
+    tags=["Auth Services"],
+    description="Authenticate user and generate token.",
+    request=LoginSerializer,
+    responses={
+        200: {
+            "data": {
+                "token": "string",
+                "refresh_token": "string",
+                "user": {
+                    "id": "integer",
+                    "username": "string",
+                    "email": "string",
+                },
+            },
+            "status": "success",
+            "code": 200,
+            "messages": "Login successful",
+        },
+        401: {
+            "data": None,
+            "status": "error",
+            "code": 401,
+            "messages": "Invalid credentials",
+        },
+        503: {
+            "data": None,
+            "status": "error",
+            "code": 503,
+            "messages": "Too many logins in progress. Please retry shortly.",
+        },
+    },
+)
+@csrf_exempt
+async def login(request):
+    if request.method != "POST":
+        return method_not_allowed(request)
+
+    try:
+        serializer = LoginSerializer(data=read_payload(request))
+    except orjson.JSONDecodeError as exc:
+        return parse_error(exc)
+
+    if not serializer.is_valid():
+        return json_response(error_body("Invalid input", 400, serializer.errors), 400)
+
+    username = serializer.validated_data["username"]
+    password = serializer.validated_data["password"]
+
+    try:
+        user = await User.objects.aget(username=username)
+    except User.DoesNotExist:
+        return json_response(error_body("Invalid credentials", 401), 401)
+
+    try:
+        valid = await acheck_password(password, user.password)
+    except HashPoolSaturated:
+        response = json_response(error_body("Too many logins in progress. Please retry shortly.", 503), 503)
+        response["Retry-After"] = str(LOGIN_RETRY_AFTER)
+        return response
+
+    if not valid:
+        return json_response(error_body("Invalid credentials", 401), 401)
+
+    token = str(uuid.uuid4())
+    refresh_token = str(uuid.uuid4())
+    evict_token(user.token)
+    await User.objects.filter(pk=user.pk).aupdate(
+        token=token, refresh_token=refresh_token, updated_at=timezone.now()
+    )
+
+    return json_response(success_body(
+        {
+            "token": token,
+            "refresh_token": refresh_token,
+            "user": {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+            },
+        },
+        "Login successful",
+    ))
+
+
+@document(
+    methods=("POST",),
+    operation_id="logout_user",
+    tags=["Auth Services"],
+    description="Logout user and clear token.",
+    request={"application/json": {"example": {"token": "user-token"}}},
+    responses={
+        200: {
+            "data": None,
+            "status": "success",
+            "code": 200,
+            "messages": "Logged out successfully",
+        },
+        400: {
+            "data": None,
+            "status": "error",
+            "code": 400,
+            "messages": "Token is required",
+        },
+        401: {
+            "data": None,
+            "status": "error",
+            "code": 401,
+            "messages": "Invalid token",
+        },
+    },
+)
+@csrf_exempt
+async def logout(request):
+    if request.method != "POST":
+        return method_not_allowed(request)
+
+    try:
+        payload = read_payload(request)
+    except orjson.JSONDecodeError as exc:
+        return parse_error(exc)
+
+    token = payload.get("token") if isinstance(payload, dict) else None
+
+    if not token:
+        return json_response(error_body("Token is required", 400), 400)
+
+    cleared = await User.objects.filter(token=token).aupdate(
+        token=None, refresh_token=None, updated_at=timezone.now()
+    )
+    if not cleared:
+        return json_response(error_body("Invalid token", 401), 401)
+
+    evict_token(token)
+    return json_response(success_body(None, "Logged out successfully"))
+
+
+async def roles_version(request, *args, **kwargs):
+    return await atable_version(Role)
+
+
+@query_budget(3)
+@async_api_view(
+    permission_classes=[UserPermission],
+    operation_id="get_roles_by_id",
+    tags=["Roles Services"],
+    description="Retrieve a specific role by ID.",
+    responses=RoleSerializer,
+)
+@async_conditional_get(roles_version)
+async def retrieve_role(request, pk):
+    role = await role_reader.values(Role.objects.filter(pk=pk)).afirst()
+    if role is None:
+        return json_response(error_body("Role not found", 404), 404)
+
+    return json_response(success_body(role_reader.to_representation(role), "Role retrieved successfully"))
+
+
+@query_budget(3)
+@async_api_view(
+    permission_classes=[UserPermission],
+    operation_id="get_all_roles",
+    tags=["Roles Services"],
+    description="Retrieve all roles.",
+    responses=RoleSerializer(many=True),
+)
+@async_conditional_get(roles_version)
+async def all_roles(request):
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(role_reader.values(Role.objects.all()), Request(request))
+    if not page:
+        return json_response(error_body("No roles available", 204), 204)
+
+    return json_response(success_body(
+        role_reader.serialize(page),
+        "Roles retrieved successfully",
+        pagination=paginator.get_pagination_meta()
+    ))
@@ -1,24 +1,180 @@
+import threading
+import time
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import DEFAULT_DB_ALIAS
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from configs.models import User
+from configs.cache import TTLCache
+from configs.models import User, Role, UserRole
+from configs.versions import atable_version, table_version
 
-class CustomTokenAuthentication(BaseAuthentication):
-    def authenticate(self, request):
-        auth_header = request.headers.get("Authorization")
-        if not auth_header:
-            return None
+USER_FIELDS = [field.attname for field in User._meta.concrete_fields]
+USER_ID_INDEX = USER_FIELDS.index("id")
+
+# token -> (database alias, concrete field values, role names). Hits run no
+# query; instead each worker compares the auth tables' version with the one it
+# last saw at most once per TOKEN_CACHE_CHECK_INTERVAL seconds and drops the
+# principals of users changed since, so a logout, password change, deactivation
+# or role change made in any worker takes effect within the interval.
+token_cache = TTLCache(
+    settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL, index=lambda principal: principal[1][USER_ID_INDEX]
+)
+
+
+def auth_sources():
+    return [model.objects.using(DEFAULT_DB_ALIAS) for model in (User, UserRole, Role)]
+
+
+def changed_users(since):
+    return User.objects.using(DEFAULT_DB_ALIAS).filter(updated_at__gt=since).values_list("pk", flat=True)
+
+
+class TokenCacheCheck:
+    """Rate-limited comparison of the auth tables with the version this worker last saw."""
+
+    def __init__(self):
+        self.version = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def begin(self):
+        """True if this caller should run the check now; at most one caller per interval."""
+        if time.monotonic() - self.checked_at < settings.TOKEN_CACHE_CHECK_INTERVAL:
+            return False
+        if not self._lock.acquire(blocking=False):
+            return False
+        self.checked_at = time.monotonic()
+        # Principals cached from now on are loaded after this check, so with an
+        # empty cache there is nothing to compare.
+        if not len(token_cache):
+            self._lock.release()
+            return False
+        return True
 
-        parts = auth_header.split()
-        if len(parts) != 2 or parts[0].lower() != "token":
+    def compare(self, version):
+        """The updated_at after which users changed, or None once nothing is left to evict by user."""
+        previous, self.version = self.version, version
+        if previous == version:
             return None
+        if previous is None or previous[0][0] != version[0][0] or previous[1:] != version[1:] or previous[0][1] is None:
+            token_cache.clear()
+            return None
+        return previous[0][1]
+
+    def end(self, user_ids=()):
+        for user_id in user_ids:
+            token_cache.delete_indexed(user_id)
+        self._lock.release()
+
+
+token_check = TokenCacheCheck()
+
+
+def check_token_cache():
+    if not token_check.begin():
+        return
+    user_ids = ()
+    try:
+        since = token_check.compare(table_version(*auth_sources())[0])
+        if since is not None:
+            user_ids = list(changed_users(since))
+    finally:
+        token_check.end(user_ids)
+
+
+async def acheck_token_cache():
+    if not token_check.begin():
+        return
+    user_ids = ()
+    try:
+        since = token_check.compare((await atable_version(*auth_sources()))[0])
+        if since is not None:
+            user_ids = [user_id async for user_id in changed_users(since)]
+    finally:
+        token_check.end(user_ids)
+
+
+def principal_query(token):
+    """The token's user with its role names, in one query."""
+    return User.objects.using(DEFAULT_DB_ALIAS).filter(token=token).annotate(
+        role_names=ArrayAgg("userrole__role__rolename")
+    )
+
+
+def build_principal(user):
+    values = tuple(getattr(user, field) for field in USER_FIELDS)
+    roles = frozenset(name for name in user.role_names if name is not None)
+    return (user._state.db, values, roles)
 
-        token = parts[1]
 
+def load_principal(token):
+    return build_principal(principal_query(token).get())
+
+
+async def aload_principal(token):
+    return build_principal(await principal_query(token).aget())
+
+
+def resolve_principal(token):
+    check_token_cache()
+    principal = token_cache.get(token)
+    if principal is None:
         try:
-            user = User.objects.get(token=token)
-            if not user.is_active:
-                raise AuthenticationFailed("User is inactive")
+            principal = load_principal(token)
         except User.DoesNotExist:
             raise AuthenticationFailed("Invalid token")
+        token_cache.set(token, principal)
+    return principal
+
+
+def get_token(request):
+    auth_header = request.headers.get("Authorization")
+    if not auth_header:
+        return None
+
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != "token":
+        return None
+    return parts[1]
+
+
+def build_user(principal):
+    db, values, roles = principal
+    user = User.from_db(db, USER_FIELDS, values)
+    user.role_names = roles
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive")
+    return user
+
+
+async def aauthenticate(request):
+    """Async counterpart of CustomTokenAuthentication.authenticate for plain async views."""
+    token = get_token(request)
+    if token is None:
+        return None
+
+    await acheck_token_cache()
+    principal = token_cache.get(token)
+    if principal is None:
+        try:
+            principal = await aload_principal(token)
+        except User.DoesNotExist:
+            raise AuthenticationFailed("Invalid token")
+        token_cache.set(token, principal)
+
+    return build_user(principal)
+
+
+def evict_token(token):
+    if token:
+        token_cache.delete(token)
+
+
+class CustomTokenAuthentication(BaseAuthentication):
+    def authenticate(self, request):
+        token = get_token(request)
+        if token is None:
+            return None
 
-        return (user, None)
+        return (build_user(resolve_principal(token)), None)
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    ``index(value)`` optionally names a second key per entry, such as the product
+    id of a barcode entry, so delete_indexed can drop entries by it in O(1).
+    """
+
+    def __init__(self, maxsize, ttl, index=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._index = index
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def _discard(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None and self._index is not None:
+            name = self._index(entry[0])
+            keys = self._keys.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys[name]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._discard(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            if self._index is not None:
+                self._keys.setdefault(self._index(value), set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._discard(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def delete_indexed(self, name):
+        with self._lock:
+            for key in list(self._keys.get(name, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,32 @@
+from django.db import connections
+
+
+def is_pooled(alias="default"):
+    return bool(connections[alias].settings_dict.get("OPTIONS", {}).get("pool"))
+
+
+def pool_stats(alias="default"):
+    """Connection pool gauges and counters for this process, or None when the alias is not pooled."""
+    if not is_pooled(alias):
+        return None
+
+    pool = connections[alias].pool
+    stats = pool.get_stats()
+    size = stats.get("pool_size", 0)
+    idle = stats.get("pool_available", 0)
+    return {
+        "min_size": stats.get("pool_min", pool.min_size),
+        "max_size": stats.get("pool_max", pool.max_size),
+        "size": size,
+        "idle": idle,
+        "in_use": size - idle,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "requests_queued": stats.get("requests_queued", 0),
+        "request_wait_ms": stats.get("requests_wait_ms", 0),
+        # Requests that timed out or were rejected while waiting for a connection
+        "request_errors": stats.get("requests_errors", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connection_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
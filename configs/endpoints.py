@@ -0,0 +1,61 @@
+from django.urls import NoReverseMatch, URLResolver, Resolver404, get_resolver, resolve, reverse
+from configs.schema import schema_callback
+
+
+def iter_patterns(patterns, namespace=""):
+    for entry in patterns:
+        if isinstance(entry, URLResolver):
+            yield from iter_patterns(entry.url_patterns, ":".join(filter(None, [namespace, entry.namespace])))
+        elif entry.name:
+            yield (f"{namespace}:{entry.name}" if namespace else entry.name), entry
+
+
+# URL kwarg value for routes without a sample row; the view should answer 404.
+PLACEHOLDER = "0"
+
+# Query strings for routes that answer 400 without one.
+SAMPLE_QUERIES = {
+    "products:get-products-search": "q=product",
+}
+
+
+def sample_queryset(entry):
+    view = getattr(schema_callback(entry.callback), "cls", None)
+    queryset = getattr(view, "queryset", None)
+    if queryset is None and getattr(view, "serializer_class", None) is not None:
+        queryset = view.serializer_class.Meta.model._default_manager.all()
+    return queryset
+
+
+def sample_kwargs(entry):
+    """URL kwargs for a request to this route: a sample row's values when they are fields of the view's model,
+    else PLACEHOLDER; None for DRF's format-suffix duplicates of a route."""
+    names = list(entry.pattern.regex.groupindex)
+    if not names:
+        return {}
+    if "format" in names:
+        return None
+
+    queryset = sample_queryset(entry)
+    if queryset is not None and set(names) <= {"pk"} | {field.name for field in queryset.model._meta.concrete_fields}:
+        row = queryset.order_by("pk").values(*names).first()
+        if row is not None:
+            return row
+    return dict.fromkeys(names, PLACEHOLDER)
+
+
+def get_endpoints():
+    """(path, resolver match) of every named route with its kwargs filled from sample rows, one per path."""
+    endpoints = {}
+    for name, entry in iter_patterns(get_resolver().url_patterns):
+        kwargs = sample_kwargs(entry)
+        if kwargs is None:
+            continue
+        try:
+            path = reverse(name, kwargs=kwargs)
+            match = resolve(path)
+        except (NoReverseMatch, Resolver404):
+            continue
+        query = SAMPLE_QUERIES.get(name)
+        endpoints.setdefault(f"{path}?{query}" if query else path, match)
+    return list(endpoints.items())
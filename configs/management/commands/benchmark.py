@@ -0,0 +1,249 @@
+import http.client
+import itertools
+import math
+import platform
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlsplit
+import django
+import orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from configs.endpoints import get_endpoints
+from configs.seeding import SEED_PREFIX, clear_seed, seed
+from products.models import Product
+
+# GET routes left out by default: API docs, and module install/uninstall/upgrade,
+# which change the module table on every call.
+DEFAULT_EXCLUDE = r"^/services/(schema|docs|redoc)/|^/services/modules/(install|uninstall|upgrade)/"
+
+# Query strings for GET routes that need one to do real work
+QUERY_STRINGS = {
+    "products:get-products-search": "?q=Widget",
+}
+
+
+class InProcessClient:
+    """Send requests through the full middleware stack in this process."""
+
+    def __init__(self, token):
+        self.client = Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Token {token}")
+
+    def request(self, method, path, body):
+        response = self.client.generic(method, path, body or b"", content_type="application/json")
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response.status_code
+
+    def close(self):
+        connections.close_all()
+
+
+class HttpClient:
+    """Send requests to a running server over one keep-alive connection."""
+
+    def __init__(self, url, token):
+        parts = urlsplit(url)
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Authorization": f"Token {token}", "Content-Type": "application/json"}
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=60)
+
+    def request(self, method, path, body):
+        try:
+            self.connection.request(method, self.prefix + path, body=body, headers=self.headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            raise
+        return response.status
+
+    def close(self):
+        self.connection.close()
+
+
+def percentile(ordered, fraction):
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset with COPY, drive every route with concurrent clients and report "
+        "throughput and p50/p95/p99 latency per endpoint to a JSON file. The dataset is removed afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10000, help="Synthetic products to seed.")
+        parser.add_argument("--users", type=int, default=1000, help="Synthetic users to seed (the first is an administrator).")
+        parser.add_argument("--roles", type=int, default=10, help="Synthetic roles to seed.")
+        parser.add_argument("--roles-per-user", type=int, default=2, help="Roles linked to each synthetic user.")
+        parser.add_argument("--modules", type=int, default=10, help="Synthetic modules to seed.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed of the dataset.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint.")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint.")
+        parser.add_argument("--url", help="Benchmark a running server at this base URL instead of in-process.")
+        parser.add_argument("--exclude", default=DEFAULT_EXCLUDE, help="Regex of GET paths to leave out.")
+        parser.add_argument("--output", default="benchmark.json", help="JSON result file.")
+        parser.add_argument("--label", default="", help="Free-form name of this run, e.g. the release.")
+        parser.add_argument(
+            "--i-know", action="store_true",
+            help="Run with DEBUG off; only do this against a database you can afford to write to.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+
+        if not settings.DEBUG and not options["i_know"]:
+            raise CommandError(
+                "The benchmark writes a synthetic dataset, including an administrator, to the configured "
+                "database. Run it with DEBUG on, or pass --i-know."
+            )
+
+        started_at = timezone.now()
+        seed_timings, token, password = seed(
+            products=options["products"], users=options["users"], roles=options["roles"],
+            roles_per_user=options["roles_per_user"], modules=options["modules"], random_seed=options["seed"],
+        )
+        for table, seconds in seed_timings.items():
+            self.stdout.write(f"seed {table}: {seconds:.2f}s")
+
+        try:
+            results = self.run_scenarios(token, password, options)
+        finally:
+            with transaction.atomic():
+                clear_seed()
+
+        report = {
+            "label": options["label"],
+            "started_at": started_at.isoformat(),
+            "target": options["url"] or "in-process",
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "dataset": {
+                field: options[field] for field in ("products", "users", "roles", "roles_per_user", "modules", "seed")
+            },
+            "seed_seconds": seed_timings,
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "endpoints": results,
+        }
+        with open(options["output"], "wb") as handle:
+            handle.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} endpoints to {options['output']}"))
+
+    def run_scenarios(self, token, password, options):
+        if options["url"]:
+            make_client = lambda: HttpClient(options["url"], token)
+        else:
+            make_client = lambda: InProcessClient(token)
+
+        results = []
+        for name, method, path, payload in self.scenarios(options["exclude"], password):
+            result = self.run_endpoint(make_client, method, path, payload, options)
+            if result is None:
+                continue
+            result["name"] = name
+            results.append(result)
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{method:6} {path:55} {result['throughput_rps']:8.1f} req/s  "
+                f"p50 {latency['p50']:7.2f}  p95 {latency['p95']:7.2f}  p99 {latency['p99']:7.2f} ms  "
+                f"{dict(result['status'])}"
+            )
+        return results
+
+    def scenarios(self, exclude, password):
+        """(name, method, path, payload factory) for every GET route plus representative writes."""
+        excluded = re.compile(exclude) if exclude else None
+        for path, match in get_endpoints():
+            if excluded is None or not excluded.search(path):
+                yield match.view_name, "GET", path + QUERY_STRINGS.get(match.view_name, ""), None
+
+        run = uuid.uuid4().hex[:8]
+        product = Product.alive.filter(barcode__startswith=SEED_PREFIX).order_by("id").values("id", "barcode").first()
+        if product is not None:
+            path = reverse("products:get-products-barcode", kwargs={"barcode": product["barcode"]})
+            yield "products:get-products-barcode", "GET", path, None
+
+        yield "async-login", "POST", reverse("async-login"), lambda index: {
+            "username": f"{SEED_PREFIX}user-1", "password": password,
+        }
+        yield "products:create-product-list", "POST", reverse("products:create-product-list"), lambda index: {
+            "product_name": f"Benchmark product {index}", "barcode": f"{SEED_PREFIX}{run}-{index}",
+            "price": "9.99", "stock": 1,
+        }
+        if product is not None:
+            path = reverse("products:stock-product-increment", kwargs={"pk": product["id"]})
+            yield "products:stock-product-increment", "POST", path, lambda index: {"quantity": 1}
+
+    def run_endpoint(self, make_client, method, path, payload, options):
+        """Measure one endpoint; None when it does not accept the method."""
+        sequence = itertools.count()
+
+        def body():
+            return orjson.dumps(payload(next(sequence))) if payload else None
+
+        client = make_client()
+        try:
+            for _ in range(max(options["warmup"], 1)):
+                if client.request(method, path, body()) == 405:
+                    return None
+        finally:
+            client.close()
+
+        total = options["requests"]
+        tickets = itertools.count()
+        samples = []
+        lock = threading.Lock()
+
+        def worker():
+            client = make_client()
+            local = []
+            try:
+                while next(tickets) < total:
+                    data = body()
+                    started = time.perf_counter()
+                    try:
+                        status = client.request(method, path, data)
+                    except Exception:
+                        status = "error"
+                    local.append((time.perf_counter() - started, status))
+            finally:
+                client.close()
+                with lock:
+                    samples.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(max(options["concurrency"], 1))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(seconds * 1000 for seconds, _ in samples)
+        return {
+            "method": method,
+            "path": path,
+            "requests": len(samples),
+            "seconds": elapsed,
+            "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "mean": sum(latencies) / len(latencies),
+                "max": latencies[-1],
+            },
+            "status": dict(sorted(Counter(str(status) for _, status in samples).items())),
+        }
@@ -0,0 +1,97 @@
+import uuid
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from configs.authentication import token_cache
+from configs.endpoints import get_endpoints
+from configs.metrics import request_statements
+from configs.models import User, Role, UserRole
+from configs.query_budget import find_problems, view_budget
+from configs.roles import role_cache
+from engines.state import invalidate_module_state
+from products.cache import barcode_cache
+
+
+def clear_caches():
+    token_cache.clear()
+    role_cache.clear()
+    barcode_cache.clear()
+    invalidate_module_state()
+
+
+async def adrain(chunks):
+    async for _ in chunks:
+        pass
+
+
+def drain_response(response):
+    """Read a streaming response to the end so the queries its generator runs are made (and counted) now."""
+    if not response.streaming:
+        return
+    if response.is_async:
+        async_to_sync(adrain)(response.streaming_content)
+    else:
+        for _ in response.streaming_content:
+            pass
+
+
+class Command(BaseCommand):
+    help = "GET every registered route with empty caches and check it against its view's query budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat-limit", type=int, default=None,
+            help="Report a SQL shape run this many times in one request (default QUERY_REPEAT_LIMIT).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            failures = self.check_routes(options["repeat_limit"])
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{failures} route(s) over their query budget.")
+        self.stdout.write(self.style.SUCCESS("All routes are within their query budgets."))
+
+    def check_routes(self, repeat_limit):
+        # A throwaway administrator, rolled back with everything else.
+        token = str(uuid.uuid4())
+        user = User.objects.create(
+            username=f"query-budget-{token}", email=f"{token}@query-budget.invalid", password="!", token=token
+        )
+        UserRole.objects.create(user=user, role=Role.objects.get(rolename="administrator"))
+
+        client = Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Token {token}")
+        failures = 0
+
+        with override_settings(QUERY_BUDGET="off"):
+            for path, match in get_endpoints():
+                # Some GET routes write (module install/uninstall), so each one
+                # runs in its own savepoint against the same starting data.
+                clear_caches()
+                statements = []
+                with transaction.atomic():
+                    context = request_statements.set(statements)
+                    try:
+                        response = client.get(path)
+                        drain_response(response)
+                    finally:
+                        request_statements.reset(context)
+                    transaction.set_rollback(True)
+
+                if response.status_code == 405:
+                    continue
+
+                budget = view_budget(match.func, "GET")
+                problems = find_problems(statements, budget, repeat_limit)
+                line = f"GET {path} [{match.view_name}] {response.status_code}: {len(statements)}/{budget} queries"
+                if problems:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"FAIL {line}"))
+                    for problem in problems:
+                        self.stdout.write(f"    {problem}")
+                else:
+                    self.stdout.write(f"ok   {line}")
+
+        return failures
@@ -0,0 +1,59 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DatabaseError
+from configs.db import is_pooled, pool_stats
+
+
+class Command(BaseCommand):
+    help = "Check database connectivity and latency, and report connection pool health and statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias to check.")
+        parser.add_argument("--repeat", type=int, default=5, help="Round trips used to measure query latency.")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        connection = connections[alias]
+        config = connection.settings_dict
+        self.stdout.write(f"{alias}: {config['USER']}@{config['HOST']}:{config['PORT']}/{config['NAME']}")
+
+        try:
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT now(), version()")
+                server_time, version = cursor.fetchone()
+            connect_ms = (time.perf_counter() - started) * 1000
+
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                timings.append((time.perf_counter() - started) * 1000)
+        except DatabaseError as exc:
+            raise CommandError(f"Connection failed: {exc}")
+
+        self.stdout.write(f"Server time: {server_time}")
+        self.stdout.write(f"Server version: {version}")
+        self.stdout.write(f"First query (includes connecting): {connect_ms:.1f} ms")
+        if timings:
+            self.stdout.write(f"Round trip: min {min(timings):.2f} ms, max {max(timings):.2f} ms")
+
+        if not is_pooled(alias):
+            self.stdout.write(
+                f"Pooling disabled; CONN_MAX_AGE={config['CONN_MAX_AGE']}, "
+                f"CONN_HEALTH_CHECKS={config['CONN_HEALTH_CHECKS']}"
+            )
+            self.stdout.write(self.style.SUCCESS("Database OK."))
+            return
+
+        connection.close()
+        try:
+            connection.pool.check()
+        except DatabaseError as exc:
+            raise CommandError(f"Pool health check failed: {exc}")
+
+        for key, value in pool_stats(alias).items():
+            self.stdout.write(f"  {key}: {value}")
+        self.stdout.write(self.style.SUCCESS("Database and connection pool OK."))
@@ -0,0 +1,63 @@
+import csv
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from configs.provisioning import provision_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users in bulk from a JSON list or a CSV file with username, email, password, "
+        "roles (role IDs separated by ';') and optional is_active columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON or CSV file with one user per row.")
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Processes used to hash passwords (default: the PASSWORD_HASH_WORKERS thread pool).",
+        )
+        parser.add_argument("--report", help="Write the per-row results to this JSON file.")
+
+    def read_rows(self, path):
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            if path.endswith(".json"):
+                rows = json.load(handle)
+                if not isinstance(rows, list):
+                    raise CommandError("JSON file must contain a list of users.")
+                return rows
+
+            rows = []
+            for row in csv.DictReader(handle):
+                row["roles"] = [role for role in (row.get("roles") or "").split(";") if role.strip()]
+                if not row.get("is_active"):
+                    row.pop("is_active", None)
+                rows.append(row)
+            return rows
+
+    def handle(self, *args, **options):
+        try:
+            rows = self.read_rows(options["path"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {options['path']}: {exc}")
+
+        started = time.monotonic()
+        try:
+            results = provision_users(rows, workers=options["workers"])
+        except IntegrityError as exc:
+            raise CommandError(f"Users changed while provisioning, nothing was created: {exc}")
+        elapsed = time.monotonic() - started
+
+        for result in results:
+            if result["status"] == "error":
+                self.stderr.write(f"row {result['index']}: {json.dumps(result['errors'])}")
+
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as handle:
+                json.dump(results, handle, indent=2)
+
+        created = sum(1 for result in results if result["status"] == "created")
+        self.stdout.write(self.style.SUCCESS(
+            f"{created} user(s) created, {len(results) - created} failed in {elapsed:.1f}s."
+        ))
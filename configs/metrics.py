@@ -0,0 +1,291 @@
+import glob
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+import orjson
+from django.conf import settings
+from configs.authentication import token_cache
+from configs.db import pool_stats
+from configs.roles import role_cache
+from products.cache import barcode_cache
+
+# Upper bounds (seconds) of the request latency histogram; +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CACHES = {
+    "token": token_cache,
+    "role": role_cache,
+    "barcode": barcode_cache,
+}
+
+# Query counter of the request being handled in this context. Async views run
+# their ORM calls in executor threads; sync_to_async copies the context, so
+# those queries land on the same counter.
+request_queries = ContextVar("request_queries", default=None)
+
+# SQL run by the current request, collected only while configs.middleware.query_budget is on
+request_statements = ContextVar("request_statements", default=None)
+
+# (start time, list of queries) of a request being profiled by configs.middleware.profiling
+request_timeline = ContextVar("request_timeline", default=None)
+
+
+class QueryCounter:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    statements = request_statements.get()
+    if statements is not None:
+        statements.append(sql)
+
+    counter = request_queries.get()
+    timeline = request_timeline.get()
+    if counter is None and timeline is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        if counter is not None:
+            counter.count += 1
+            counter.seconds += elapsed
+        if timeline is not None:
+            origin, queries = timeline
+            queries.append({
+                "start_ms": (start - origin) * 1000,
+                "duration_ms": elapsed * 1000,
+                "alias": context["connection"].alias,
+                "many": many,
+                "sql": sql,
+            })
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver that makes every connection report to record_query."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def new_route():
+    return {
+        "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+        "count": 0,
+        "seconds": 0.0,
+        "queries": 0,
+        "query_seconds": 0.0,
+        "bytes": 0,
+        "status": {},
+    }
+
+
+class Registry:
+    """Request metrics of this process, flushed to METRICS_DIR so any worker can report the sum of all."""
+
+    def __init__(self):
+        self.routes = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run, name="metrics-flush", daemon=True)
+                self._thread.start()
+
+    def observe(self, labels, status, seconds, queries, query_seconds, size):
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+        with self._lock:
+            route = self.routes.get(labels)
+            if route is None:
+                route = self.routes[labels] = new_route()
+            route["buckets"][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            route["count"] += 1
+            route["seconds"] += seconds
+            route["queries"] += queries
+            route["query_seconds"] += query_seconds
+            route["bytes"] += size
+            status = str(status)
+            route["status"][status] = route["status"].get(status, 0) + 1
+
+    def add_bytes(self, labels, size):
+        with self._lock:
+            route = self.routes.get(labels)
+            if route is not None:
+                route["bytes"] += size
+
+    def snapshot(self):
+        with self._lock:
+            routes = [
+                [list(labels), dict(route, buckets=list(route["buckets"]), status=dict(route["status"]))]
+                for labels, route in self.routes.items()
+            ]
+        return {
+            "pid": os.getpid(),
+            "time": time.time(),
+            "routes": routes,
+            "caches": {name: cache.stats() for name, cache in CACHES.items()},
+            "pool": pool_stats(),
+        }
+
+    def path(self, pid):
+        return os.path.join(settings.METRICS_DIR, f"{pid}.json")
+
+    def flush(self):
+        snapshot = self.snapshot()
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = self.path(snapshot["pid"])
+        temp = f"{path}.tmp"
+        with open(temp, "wb") as handle:
+            handle.write(orjson.dumps(snapshot))
+        os.replace(temp, path)
+
+    def run(self):
+        while True:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def worker_snapshots(self):
+        """This process's live snapshot plus the last flush of every other worker."""
+        own = self.snapshot()
+        snapshots = [own]
+        now = time.time()
+
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json")):
+            try:
+                if now - os.path.getmtime(path) > settings.METRICS_RETENTION:
+                    os.remove(path)
+                    continue
+                with open(path, "rb") as handle:
+                    snapshot = orjson.loads(handle.read())
+            except (OSError, orjson.JSONDecodeError):
+                continue
+            if snapshot.get("pid") != own["pid"]:
+                snapshots.append(snapshot)
+
+        return snapshots
+
+
+registry = Registry()
+
+
+def aggregate(snapshots):
+    """Sum the counters of all snapshots; gauges only come from workers that flushed recently."""
+    routes = {}
+    caches = {}
+    pools = []
+    live = 0
+    fresh_after = time.time() - 3 * settings.METRICS_FLUSH_INTERVAL
+
+    for snapshot in snapshots:
+        for labels, route in snapshot["routes"]:
+            total = routes.setdefault(tuple(labels), new_route())
+            total["buckets"] = [a + b for a, b in zip(total["buckets"], route["buckets"])]
+            for field in ("count", "seconds", "queries", "query_seconds", "bytes"):
+                total[field] += route[field]
+            for status, count in route["status"].items():
+                total["status"][status] = total["status"].get(status, 0) + count
+
+        fresh = snapshot["time"] >= fresh_after
+        live += fresh
+        for name, stats in snapshot["caches"].items():
+            total = caches.setdefault(name, {"size": 0, "maxsize": 0, "hits": 0, "misses": 0, "evictions": 0})
+            for field in ("hits", "misses", "evictions"):
+                total[field] += stats[field]
+            if fresh:
+                total["size"] += stats["size"]
+                total["maxsize"] += stats["maxsize"]
+        if fresh and snapshot["pool"]:
+            pools.append(snapshot["pool"])
+
+    return routes, caches, pools, live
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(**labels):
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+
+POOL_GAUGES = ("min_size", "max_size", "size", "idle", "in_use", "waiting")
+POOL_COUNTERS = (
+    "requests", "requests_queued", "request_errors",
+    "connections_opened", "connection_errors", "connections_lost",
+)
+
+
+def render_metrics():
+    """Prometheus text exposition of the metrics of every worker."""
+    routes, caches, pools, live = aggregate(registry.worker_snapshots())
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family("app_workers", "gauge", "Workers that reported metrics recently.")
+    lines.append(f"app_workers {live}")
+
+    family("http_request_duration_seconds", "histogram", "Request latency by view and action.")
+    for (view, action, method), route in sorted(routes.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), route["buckets"]):
+            cumulative += count
+            labels = format_labels(view=view, action=action, method=method, le=bound)
+            lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+        labels = format_labels(view=view, action=action, method=method)
+        lines.append(f"http_request_duration_seconds_sum{labels} {route['seconds']}")
+        lines.append(f"http_request_duration_seconds_count{labels} {route['count']}")
+
+    family("http_requests_total", "counter", "Responses by view, action and status code.")
+    for (view, action, method), route in sorted(routes.items()):
+        for status, count in sorted(route["status"].items()):
+            labels = format_labels(view=view, action=action, method=method, status=status)
+            lines.append(f"http_requests_total{labels} {count}")
+
+    for name, field, help_text in (
+        ("http_response_bytes_total", "bytes", "Response body bytes by view and action."),
+        ("db_queries_total", "queries", "Database queries run by view and action."),
+        ("db_query_duration_seconds_total", "query_seconds", "Time spent in database queries by view and action."),
+    ):
+        family(name, "counter", help_text)
+        for (view, action, method), route in sorted(routes.items()):
+            lines.append(f"{name}{format_labels(view=view, action=action, method=method)} {route[field]}")
+
+    for name, field, kind, help_text in (
+        ("cache_entries", "size", "gauge", "Entries held by the in-process cache."),
+        ("cache_max_entries", "maxsize", "gauge", "Capacity of the in-process cache."),
+        ("cache_hits_total", "hits", "counter", "Cache hits."),
+        ("cache_misses_total", "misses", "counter", "Cache misses."),
+        ("cache_evictions_total", "evictions", "counter", "Entries evicted to stay within capacity."),
+    ):
+        family(name, kind, help_text)
+        for cache, stats in sorted(caches.items()):
+            lines.append(f"{name}{format_labels(cache=cache)} {stats[field]}")
+
+    if pools:
+        for field in POOL_GAUGES:
+            family(f"db_pool_{field}", "gauge", f"Connection pool {field.replace('_', ' ')}, summed over workers.")
+            lines.append(f"db_pool_{field} {sum(pool[field] for pool in pools)}")
+        for field in POOL_COUNTERS:
+            family(f"db_pool_{field}_total", "counter", f"Connection pool {field.replace('_', ' ')}.")
+            lines.append(f"db_pool_{field}_total {sum(pool[field] for pool in pools)}")
+        family("db_pool_request_wait_seconds_total", "counter", "Time requests waited for a pooled connection.")
+        lines.append(f"db_pool_request_wait_seconds_total {sum(pool['request_wait_ms'] for pool in pools) / 1000}")
+
+    return "\n".join(lines) + "\n"
@@ -1,24 +1,107 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import JsonResponse
-from django.urls import resolve
-from engines.models import Module
-from configs.utils import error_response
+from django.urls import Resolver404, get_resolver, resolve
+from django.urls.resolvers import URLResolver, RoutePattern
+from engines.state import is_module_blocked, ais_module_blocked
+
+REGEX_SPECIAL_CHARS = set("\\.^$*+?{}[]()|")
+
+
+def literal_prefix(pattern):
+    """Return the literal leading part of a URL pattern and whether it is the whole pattern."""
+    if isinstance(pattern, RoutePattern):
+        route = str(pattern)
+        index = route.find("<")
+        return (route, True) if index == -1 else (route[:index], False)
+
+    regex = pattern.regex.pattern.lstrip("^")
+    for index, char in enumerate(regex):
+        if char in REGEX_SPECIAL_CHARS:
+            complete = regex[index:] == "$"
+            return regex[:index], complete
+    return regex, False
+
+
+def build_route_table(patterns, prefix="/", namespace="", exact=None, prefixes=None):
+    """Flatten the URLconf into exact-path and path-prefix lookups of their namespace."""
+    exact = {} if exact is None else exact
+    prefixes = {} if prefixes is None else prefixes
+
+    for entry in patterns:
+        literal, complete = literal_prefix(entry.pattern)
+        route = prefix + literal
+
+        if isinstance(entry, URLResolver):
+            entry_namespace = ":".join(filter(None, [namespace, entry.namespace]))
+            if complete:
+                build_route_table(entry.url_patterns, route, entry_namespace, exact, prefixes)
+            else:
+                prefixes.setdefault(route, entry_namespace)
+        elif complete:
+            exact.setdefault(route, namespace)
+        else:
+            prefixes.setdefault(route, namespace)
+
+    return exact, prefixes
+
+
+def blocked_response():
+    return JsonResponse(
+        {
+            "data": None,
+            "status": "error",
+            "code": 403,
+            "messages": "Module not installed. Please contact administrator or manager to install."
+        }
+    )
+
 
 class Middleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.exact_routes = None
+        self.prefix_routes = None
+
+    def load_routes(self):
+        exact, prefixes = build_route_table(get_resolver().url_patterns)
+        self.prefix_routes = sorted(prefixes.items(), key=lambda item: len(item[0]), reverse=True)
+        self.exact_routes = exact
+
+    def resolve_namespace(self, path):
+        if self.exact_routes is None:
+            self.load_routes()
+
+        if path in self.exact_routes:
+            return self.exact_routes[path]
+
+        for prefix, namespace in self.prefix_routes:
+            if path.startswith(prefix):
+                return namespace
+        return ""
+
+    def is_routed(self, request):
+        """Unknown paths under a blocked module still get their 404."""
+        try:
+            resolve(request.path_info, getattr(request, "urlconf", None))
+        except Resolver404:
+            return False
+        return True
 
     def __call__(self, request):
-        resolved_url = resolve(request.path)
-        module_name = resolved_url.namespace
-        if Module.objects.filter(name=module_name, installed=False).exists():
-            return JsonResponse(
-                {
-                    "data": None,
-                    "status": "error",
-                    "code": 403,
-                    "messages": "Module not installed. Please contact administrator or manager to install."
-                }
-            )
+        if self.async_mode:
+            return self.__acall__(request)
 
+        if is_module_blocked(self.resolve_namespace(request.path_info)) and self.is_routed(request):
+            return blocked_response()
         return self.get_response(request)
 
+    async def __acall__(self, request):
+        if await ais_module_blocked(self.resolve_namespace(request.path_info)) and self.is_routed(request):
+            return blocked_response()
+        return await self.get_response(request)
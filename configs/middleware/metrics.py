@@ -0,0 +1,75 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from configs.metrics import QueryCounter, registry, request_queries
+
+UNRESOLVED = "unresolved"
+
+
+def route_labels(request):
+    """(view, action, method) of the resolved route; viewsets report the action that handled the method."""
+    match = request.resolver_match
+    if match is None:
+        return (UNRESOLVED, "", request.method)
+
+    func = match.func
+    view = getattr(func, "cls", None) or getattr(func, "view_class", None) or func
+    actions = getattr(func, "actions", None) or {}
+    return (f"{view.__module__}.{view.__qualname__}", actions.get(request.method.lower(), ""), request.method)
+
+
+def count_bytes(chunks, labels):
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        registry.add_bytes(labels, size)
+
+
+class Middleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def observe(self, request, response, start, counter):
+        seconds = time.perf_counter() - start
+        labels = route_labels(request)
+
+        if not response.streaming:
+            size = len(response.content)
+        else:
+            size = 0
+            if not response.is_async:
+                response.streaming_content = count_bytes(response.streaming_content, labels)
+
+        registry.observe(labels, response.status_code, seconds, counter.count, counter.seconds, size)
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        counter = QueryCounter()
+        token = request_queries.set(counter)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        return self.observe(request, response, start, counter)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        token = request_queries.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        return self.observe(request, response, start, counter)
@@ -0,0 +1,114 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.urls import Resolver404, get_resolver
+from rest_framework.exceptions import AuthenticationFailed
+from configs.authentication import CustomTokenAuthentication, aauthenticate
+from configs.profiling import PROFILE_MODES, RequestProfile, profile_lock
+from configs.roles import ROLE_ADMINISTRATOR, get_capabilities
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+
+
+def profile_mode(value):
+    mode = value.strip().lower()
+    if mode in ("", "1", "true"):
+        return "cprofile"
+    return mode if mode in PROFILE_MODES else None
+
+
+def is_administrator(user):
+    return user is not None and bool(get_capabilities(user) & ROLE_ADMINISTRATOR)
+
+
+class Middleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def authenticate(self, request):
+        try:
+            result = CustomTokenAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return result[0] if result else None
+
+    async def aauthenticate(self, request):
+        try:
+            return await aauthenticate(request)
+        except AuthenticationFailed:
+            return None
+
+    def runs_off_thread(self, request):
+        """Whether the view runs outside this thread: always under ASGI, for coroutine views under WSGI."""
+        if self.async_mode:
+            return True
+        try:
+            match = get_resolver(getattr(request, "urlconf", None)).resolve(request.path_info)
+        except Resolver404:
+            return False
+        return iscoroutinefunction(match.func)
+
+    def begin(self, request, mode, user):
+        if not is_administrator(user) or not profile_lock.acquire(blocking=False):
+            return None
+        request.profile_user = user.username
+        profile = RequestProfile(request, mode, self.runs_off_thread(request))
+        try:
+            profile.start()
+        except BaseException:
+            profile_lock.release()
+            raise
+        return profile
+
+    def finish(self, profile, response):
+        try:
+            profile.save(response)
+        finally:
+            profile_lock.release()
+        response["X-Profile-Id"] = profile.id
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        value = request.META.get(PROFILE_HEADER)
+        mode = profile_mode(value) if value is not None else None
+        if mode is None:
+            return self.get_response(request)
+
+        profile = self.begin(request, mode, self.authenticate(request))
+        if profile is None:
+            return self.get_response(request)
+
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            profile.stop()
+            profile_lock.release()
+            raise
+        profile.stop()
+        return self.finish(profile, response)
+
+    async def __acall__(self, request):
+        value = request.META.get(PROFILE_HEADER)
+        mode = profile_mode(value) if value is not None else None
+        if mode is None:
+            return await self.get_response(request)
+
+        profile = self.begin(request, mode, await self.aauthenticate(request))
+        if profile is None:
+            return await self.get_response(request)
+
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            profile.stop()
+            profile_lock.release()
+            raise
+        profile.stop()
+        return self.finish(profile, response)
@@ -0,0 +1,60 @@
+import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from configs.metrics import request_statements
+from configs.query_budget import QueryBudgetExceeded, find_problems, view_budget
+
+logger = logging.getLogger("configs.query_budget")
+
+
+class Middleware:
+    """Dev/test check of every request against its view's query budget; removed unless QUERY_BUDGET is "log" or "raise"."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET not in ("log", "raise"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def check(self, request, statements):
+        match = request.resolver_match
+        if match is None:
+            return
+
+        problems = find_problems(statements, view_budget(match.func, request.method))
+        if not problems:
+            return
+
+        message = f"{request.method} {request.path} ({match.view_name}): " + "; ".join(problems)
+        if settings.QUERY_BUDGET == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        statements = []
+        token = request_statements.set(statements)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_statements.reset(token)
+        self.check(request, statements)
+        return response
+
+    async def __acall__(self, request):
+        statements = []
+        token = request_statements.set(statements)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_statements.reset(token)
+        self.check(request, statements)
+        return response
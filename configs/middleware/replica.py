@@ -0,0 +1,89 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from configs.routers import read_replica, replica_monitor
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# A client reads from the primary for REPLICA_PIN_SECONDS after a successful
+# write. The pin is a timestamped signature the client sends back, as a cookie
+# (browsers) or the X-Primary-Pin header (POS/ERP clients that only keep their
+# token), so checking it costs no query.
+PIN_COOKIE = "primary_pin"
+PIN_HEADER = "X-Primary-Pin"
+pin_signer = signing.TimestampSigner(salt="configs.middleware.replica")
+
+
+class Middleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.enabled = bool(settings.DATABASE_REPLICAS)
+
+    def is_pinned(self, request):
+        pin = request.headers.get(PIN_HEADER) or request.COOKIES.get(PIN_COOKIE)
+        if not pin:
+            return False
+        try:
+            pin_signer.unsign(pin, max_age=settings.REPLICA_PIN_SECONDS)
+        except signing.BadSignature:
+            return False
+        return True
+
+    def choose_replica(self, request):
+        if self.is_pinned(request):
+            return None
+        return replica_monitor.connect(replica_monitor.choose())
+
+    def pin_to_primary(self, request, response):
+        if response.status_code >= 400:
+            return
+        pin = pin_signer.sign("primary")
+        response[PIN_HEADER] = pin
+        secure = request.is_secure()
+        response.set_cookie(
+            PIN_COOKIE, pin, max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True, secure=secure, samesite="None" if secure else "Lax",
+        )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        reads = self.enabled and request.method in SAFE_METHODS
+        replica = self.choose_replica(request) if reads else None
+        token = read_replica.set(replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_replica.reset(token)
+
+        # A replica that died since its last check fails the request; safe
+        # requests are idempotent, so run it again on the primary.
+        if replica is not None and response.status_code >= 500 and replica_monitor.failed(replica):
+            response = self.get_response(request)
+
+        if self.enabled and not reads:
+            self.pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        reads = self.enabled and request.method in SAFE_METHODS
+        replica = await sync_to_async(self.choose_replica)(request) if reads else None
+        token = read_replica.set(replica)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_replica.reset(token)
+
+        if replica is not None and response.status_code >= 500 and await sync_to_async(replica_monitor.failed)(replica):
+            response = await self.get_response(request)
+
+        if self.enabled and not reads:
+            self.pin_to_primary(request, response)
+        return response
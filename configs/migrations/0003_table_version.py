@@ -0,0 +1,52 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:18
+
+from django.db import migrations, models
+
+# Bumps the writing table's counter once per statement, inside the writer's
+# transaction, so readers never see new rows under an old version.
+BUMP_TABLE_VERSION_SQL = """
+    CREATE FUNCTION bump_table_version() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO tabel_version_data (table_name, version, updated_at)
+        VALUES (TG_TABLE_NAME, 1, clock_timestamp())
+        ON CONFLICT (table_name) DO UPDATE
+        SET version = tabel_version_data.version + 1, updated_at = excluded.updated_at;
+        RETURN NULL;
+    END
+    $$;
+"""
+
+VERSIONED_TABLES = ["tabel_user_data", "tabel_role_data", "tabel_user_role_data"]
+
+
+def create_trigger(table):
+    return (
+        f"CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configs', '0002_user_token_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('table_name', models.CharField(max_length=63, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'tabel_version_data',
+            },
+        ),
+        migrations.RunSQL(BUMP_TABLE_VERSION_SQL, "DROP FUNCTION bump_table_version();"),
+        *[
+            migrations.RunSQL(create_trigger(table), f"DROP TRIGGER {table}_version ON {table};")
+            for table in VERSIONED_TABLES
+        ],
+    ]
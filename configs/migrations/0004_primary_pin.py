@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configs', '0003_table_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrimaryPin',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('until', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'tabel_primary_pin_data',
+            },
+        ),
+    ]
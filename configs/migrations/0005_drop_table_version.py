@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:02
+
+from importlib import import_module
+from django.db import migrations
+
+# Table versions are now derived from row counts and updated_at (configs.utils.table_version),
+# so writers no longer queue on a shared counter row.
+table_version = import_module("configs.migrations.0003_table_version")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configs', '0004_primary_pin'),
+        ('engines', '0003_module_updated_at'),
+        ('products', '0007_drop_product_table_version'),
+    ]
+
+    operations = [
+        *[
+            migrations.RunSQL(f"DROP TRIGGER {table}_version ON {table};", table_version.create_trigger(table))
+            for table in table_version.VERSIONED_TABLES
+        ],
+        migrations.RunSQL("DROP FUNCTION bump_table_version();", table_version.BUMP_TABLE_VERSION_SQL),
+        migrations.DeleteModel(
+            name='TableVersion',
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configs', '0005_drop_table_version'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='PrimaryPin',
+        ),
+    ]
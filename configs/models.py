@@ -1,9 +1,22 @@
 from django.db import models
 import secrets
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.expressions import ArraySubquery
 from django.db import models
+from django.db.models import OuterRef
+from django.db.models.functions import JSONObject
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    def with_role_details(self):
+        """Annotate each user with [{"id", "rolename"}, ...] in the same query."""
+        roles = (
+            UserRole.objects.filter(user=OuterRef("pk"))
+            .order_by("id")
+            .values(details=JSONObject(id="role_id", rolename="role__rolename"))
+        )
+        return self.annotate(role_details=ArraySubquery(roles))
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     def create_user(self, username, email, password=None):
         if not email:
             raise ValueError("Users must have an email address")
@@ -42,6 +55,9 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         db_table = "tabel_user_data"
+        indexes = [
+            models.Index(fields=["token"], name="user_token_idx"),
+        ]
 
 class Role(models.Model):
     rolename = models.CharField(max_length=255, unique=True)
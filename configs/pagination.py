@@ -0,0 +1,70 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """Opaque cursor pagination over the primary key, so every page is an index range scan."""
+
+    ordering = "id"
+    page_size_query_param = "limit"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views; the page is fetched in a worker thread like any async ORM call."""
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+    def get_pagination_meta(self):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "limit": self.page_size,
+        }
+
+
+class RankedPagination(BasePagination):
+    """Limit/offset pagination for relevance-ordered results; it skips COUNT(*) and caps the offset."""
+
+    limit_query_param = "limit"
+    offset_query_param = "offset"
+    max_offset = settings.SEARCH_MAX_OFFSET
+
+    def get_int_param(self, request, name, default, maximum):
+        try:
+            value = int(request.query_params.get(name, default))
+        except (TypeError, ValueError):
+            value = default
+        return min(max(value, 0), maximum)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_int_param(
+            request, self.limit_query_param, settings.REST_FRAMEWORK["PAGE_SIZE"], settings.MAX_PAGE_SIZE
+        ) or settings.REST_FRAMEWORK["PAGE_SIZE"]
+        self.offset = self.get_int_param(request, self.offset_query_param, 0, self.max_offset)
+
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit and self.offset + self.limit <= self.max_offset
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_previous_link(self):
+        if self.offset <= 0:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        if self.offset - self.limit <= 0:
+            return remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.offset_query_param, self.offset - self.limit)
+
+    def get_pagination_meta(self):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "limit": self.limit,
+        }
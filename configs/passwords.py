@@ -0,0 +1,25 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+
+# PBKDF2 releases the GIL, so a small thread pool checks passwords in parallel
+# without blocking the event loop. At most LOGIN_HASH_WORKERS checks run and
+# LOGIN_HASH_QUEUE wait; anything beyond that is rejected straight away.
+hash_executor = ThreadPoolExecutor(max_workers=settings.LOGIN_HASH_WORKERS, thread_name_prefix="password-check")
+hash_slots = threading.BoundedSemaphore(settings.LOGIN_HASH_WORKERS + settings.LOGIN_HASH_QUEUE)
+
+
+class HashPoolSaturated(Exception):
+    pass
+
+
+async def acheck_password(password, encoded):
+    if not hash_slots.acquire(blocking=False):
+        raise HashPoolSaturated()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, check_password, password, encoded)
+    finally:
+        hash_slots.release()
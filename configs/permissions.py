@@ -1,62 +1,65 @@
+import hmac
+from django.conf import settings
 from rest_framework import permissions
-from configs.models import UserRole
+from configs.roles import ROLE_USER, ROLE_MANAGER, ROLE_ADMINISTRATOR, get_capabilities
+
+CAN_WRITE = ROLE_USER | ROLE_MANAGER | ROLE_ADMINISTRATOR
+CAN_DELETE = ROLE_MANAGER | ROLE_ADMINISTRATOR
+CAN_MANAGE = ROLE_MANAGER | ROLE_ADMINISTRATOR
 
-from rest_framework import permissions
-from configs.models import UserRole
 
-class ModulePermission(permissions.BasePermission):
+class RolePermission(permissions.BasePermission):
+    public_methods = frozenset()
+    required_capabilities = {}
+    default_capability = None
+
     def has_permission(self, request, view):
-        if request.method == "GET":
-            return True 
+        if request.method in self.public_methods:
+            return True
 
-        if not request.user.is_authenticated:
+        required = self.required_capabilities.get(request.method, self.default_capability)
+        if required is None:
             return False
 
-        user_roles = list(
-            UserRole.objects.filter(user=request.user)
-            .values_list("role__rolename", flat=True)
-        )
+        if not request.user or not request.user.is_authenticated:
+            return False
 
-        if request.method in ["POST", "PUT", "PATCH"]:
-            return any(role in user_roles for role in ["user", "manager", "administrator"])
+        return bool(get_capabilities(request.user) & required)
 
-        if request.method == "DELETE":
-            return any(role in user_roles for role in ["manager", "administrator"])
 
-        return False
+class ModulePermission(RolePermission):
+    public_methods = frozenset({"GET"})
+    required_capabilities = {
+        "POST": CAN_WRITE,
+        "PUT": CAN_WRITE,
+        "PATCH": CAN_WRITE,
+        "DELETE": CAN_DELETE,
+    }
 
 
-class UserPermission(permissions.BasePermission):
-    def has_permission(self, request, view):
-        if request.method == "GET":
-            return True
+class UserPermission(RolePermission):
+    public_methods = frozenset({"GET"})
+    required_capabilities = {
+        "POST": CAN_WRITE,
+        "PUT": CAN_WRITE,
+        "PATCH": CAN_WRITE,
+        "DELETE": CAN_DELETE,
+    }
 
-        if not request.user or not request.user.is_authenticated:
-            return False
 
-        try:
-            user_roles = list(UserRole.objects.filter(user=request.user).values_list("role__rolename", flat=True))
+class EnginePermission(RolePermission):
+    default_capability = CAN_MANAGE
 
-            if request.method in ["POST", "PUT", "PATCH"]:
-                return any(role in ["user", "manager", "administrator"] for role in user_roles)
-            
-            if request.method == "DELETE":
-                return any(role in ["manager", "administrator"] for role in user_roles)
 
-        except Exception as e:
-            return False
+class MetricsPermission(RolePermission):
+    default_capability = CAN_MANAGE
 
-        return False
-    
-class EnginePermission(permissions.BasePermission):
     def has_permission(self, request, view):
-        if not request.user.is_authenticated:
-            return False
-        user_roles = set(
-            UserRole.objects.filter(user=request.user)
-            .values_list("role__rolename", flat=True)
-        )
-        allowed_roles = {"manager", "administrator"}
+        token = settings.METRICS_TOKEN
+        if token and hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return True
+        return super().has_permission(request, view)
 
-        return bool(user_roles & allowed_roles)
 
+class AdministratorPermission(RolePermission):
+    default_capability = ROLE_ADMINISTRATOR
@@ -0,0 +1,219 @@
+import cProfile
+import glob
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+import orjson
+from django.conf import settings
+from django.utils import timezone
+from configs.metrics import request_timeline
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Rows kept in a stored profile
+TOP_FUNCTIONS = 60
+TOP_ALLOCATIONS = 30
+TOP_STACKS = 200
+
+# One profiled request per process at a time: tracemalloc is process-wide and
+# overlapping profiles would report each other's work.
+profile_lock = threading.Lock()
+
+
+def new_profile_id(request):
+    """Unique id, prefixed with the X-Request-ID so a retried request never overwrites an earlier profile."""
+    request_id = request.META.get("HTTP_X_REQUEST_ID", "")[:55]
+    suffix = uuid.uuid4().hex
+    return f"{request_id}-{suffix[:8]}" if PROFILE_ID.match(request_id) else suffix
+
+
+def profile_path(profile_id, suffix):
+    if not PROFILE_ID.match(profile_id):
+        return None
+    return os.path.join(settings.PROFILE_DIR, f"{profile_id}.{suffix}")
+
+
+def frame_name(code):
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+
+class Sampler:
+    """Background thread that counts the call stacks of the given threads (all others when None)."""
+
+    def __init__(self, thread_ids=None):
+        self.thread_ids = thread_ids
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.run, name="profile-sampler", daemon=True)
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(settings.PROFILE_SAMPLE_INTERVAL):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_name(frame.f_code))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def enable(self):
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class RequestProfile:
+    """Profiler, tracemalloc and SQL timeline around one request."""
+
+    def __init__(self, request, mode, all_threads):
+        # The view runs outside the request thread under ASGI, and coroutine views
+        # under WSGI run on async_to_sync's event loop thread. cProfile only sees
+        # other threads from Python 3.12 (sys.monitoring), so sample them before that.
+        if all_threads and mode == "cprofile" and sys.version_info < (3, 12):
+            mode = "sample"
+        self.request = request
+        self.mode = mode
+        self.id = new_profile_id(request)
+        self.timeline = []
+        if mode == "sample":
+            self.profiler = Sampler(None if all_threads else {threading.get_ident()})
+        else:
+            self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.started_at = timezone.now()
+        self.owns_tracemalloc = not tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            tracemalloc.start(settings.PROFILE_TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        self.baseline = tracemalloc.take_snapshot()
+        self.token = request_timeline.set((time.perf_counter(), self.timeline))
+        self.started = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self.started
+        request_timeline.reset(self.token)
+        self.snapshot = tracemalloc.take_snapshot()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+
+    def functions(self):
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+        return [
+            {
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "total_ms": total * 1000,
+                "cumulative_ms": cumulative * 1000,
+                "callers": sorted(pstats.func_std_string(caller) for caller in callers),
+            }
+            for func, (primitive_calls, calls, total, cumulative, callers) in rows
+        ]
+
+    def allocations(self):
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = self.snapshot.filter_traces(filters).compare_to(self.baseline.filter_traces(filters), "lineno")
+        return [
+            {"where": str(stat.traceback[0]), "size_kb": stat.size_diff / 1024, "count": stat.count_diff}
+            for stat in diff[:TOP_ALLOCATIONS]
+        ]
+
+    def report(self, response):
+        report = {
+            "id": self.id,
+            "mode": self.mode,
+            "method": self.request.method,
+            "path": self.request.get_full_path(),
+            "view": getattr(self.request.resolver_match, "view_name", None),
+            "user": getattr(self.request, "profile_user", None),
+            "status": response.status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration * 1000,
+            "sql_count": len(self.timeline),
+            "sql_ms": sum(query["duration_ms"] for query in self.timeline),
+            "sql": self.timeline,
+            "memory_peak_kb": self.peak / 1024,
+            "allocations": self.allocations(),
+        }
+        if self.mode == "sample":
+            report["samples"] = self.profiler.samples
+            report["stacks"] = dict(self.profiler.stacks.most_common(TOP_STACKS))
+        else:
+            report["functions"] = self.functions()
+        return report
+
+    def save(self, response):
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        with open(profile_path(self.id, "json"), "wb") as handle:
+            handle.write(orjson.dumps(self.report(response)))
+
+        if self.mode == "sample":
+            with open(profile_path(self.id, "folded"), "w", encoding="utf-8") as handle:
+                for stack, count in self.profiler.stacks.most_common():
+                    handle.write(f"{stack} {count}\n")
+        else:
+            self.profiler.dump_stats(profile_path(self.id, "prof"))
+
+        prune_profiles()
+
+
+def prune_profiles():
+    """Keep the newest PROFILE_KEEP profiles."""
+    reports = sorted(glob.glob(os.path.join(settings.PROFILE_DIR, "*.json")), key=os.path.getmtime, reverse=True)
+    for report in reports[settings.PROFILE_KEEP:]:
+        for path in glob.glob(f"{os.path.splitext(report)[0]}.*"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def list_profiles():
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(settings.PROFILE_DIR, "*.json")), key=os.path.getmtime, reverse=True):
+        try:
+            with open(path, "rb") as handle:
+                report = orjson.loads(handle.read())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        profiles.append({
+            field: report.get(field)
+            for field in ("id", "mode", "method", "path", "view", "user", "status", "started_at", "duration_ms", "sql_count")
+        })
+    return profiles
+
+
+def load_profile(profile_id):
+    path = profile_path(profile_id, "json")
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, "rb") as handle:
+        return orjson.loads(handle.read())
+
+
+def profile_download(profile_id):
+    """(path, filename) of the raw profile: pstats for cprofile, folded stacks for sample."""
+    for suffix in ("prof", "folded"):
+        path = profile_path(profile_id, suffix)
+        if path is not None and os.path.exists(path):
+            return path, os.path.basename(path)
+    return None
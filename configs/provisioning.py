@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from configs.models import User, Role, UserRole
+from configs.serializers import BulkUserSerializer
+
+# Passwords handed to each pool worker per round trip; smaller batches are hashed inline
+HASH_CHUNK_SIZE = 16
+
+# PBKDF2 releases the GIL, so requests share one bounded thread pool per
+# process; forking a multi-threaded server worker for a process pool is unsafe.
+hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+def init_hash_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash passwords with the configured hasher in the shared thread pool, or across ``workers``
+    processes when called from the provision_users command."""
+    if len(passwords) <= HASH_CHUNK_SIZE or workers == 1:
+        return [make_password(password) for password in passwords]
+    if workers is None:
+        return list(hash_executor.map(make_password, passwords))
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_hash_worker,
+        initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=HASH_CHUNK_SIZE))
+
+
+def validate_rows(rows):
+    """Validate every row up front; return per-row results and the accepted rows by index."""
+    results = []
+    accepted = {}
+    usernames = set()
+    emails = set()
+
+    for index, row in enumerate(rows):
+        serializer = BulkUserSerializer(data=row)
+        if not serializer.is_valid():
+            results.append({"index": index, "status": "error", "errors": serializer.errors})
+            continue
+
+        data = serializer.validated_data
+        errors = {}
+        if data["username"] in usernames:
+            errors["username"] = ["Duplicate username in request."]
+        if data["email"] in emails:
+            errors["email"] = ["Duplicate email in request."]
+        if errors:
+            results.append({"index": index, "status": "error", "errors": errors})
+            continue
+
+        usernames.add(data["username"])
+        emails.add(data["email"])
+        accepted[index] = data
+        results.append({"index": index, "username": data["username"]})
+
+    if accepted:
+        taken_usernames = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+        taken_emails = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+        role_ids = set(Role.objects.filter(
+            id__in={role for data in accepted.values() for role in data["roles"]}
+        ).values_list("id", flat=True))
+
+        for index, data in list(accepted.items()):
+            errors = {}
+            if data["username"] in taken_usernames:
+                errors["username"] = ["User with this username already exists."]
+            if data["email"] in taken_emails:
+                errors["email"] = ["User with this email already exists."]
+            invalid_roles = sorted(set(data["roles"]) - role_ids)
+            if invalid_roles:
+                errors["roles"] = [f"Invalid role IDs: {invalid_roles}"]
+            if errors:
+                results[index] = {"index": index, "status": "error", "errors": errors}
+                del accepted[index]
+
+    return results, accepted
+
+
+def provision_users(rows, workers=None):
+    """Create users and their role links in bulk; return one result per input row."""
+    results, accepted = validate_rows(rows)
+    if not accepted:
+        return results
+
+    indexes = list(accepted)
+    hashes = hash_passwords([accepted[index]["password"] for index in indexes], workers)
+    users = [
+        User(
+            username=accepted[index]["username"],
+            email=accepted[index]["email"],
+            password=password,
+            is_active=accepted[index]["is_active"],
+        )
+        for index, password in zip(indexes, hashes)
+    ]
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=settings.BULK_BATCH_SIZE)
+        UserRole.objects.bulk_create(
+            [
+                UserRole(user_id=user.pk, role_id=role_id)
+                for index, user in zip(indexes, users)
+                for role_id in dict.fromkeys(accepted[index]["roles"])
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+
+    for index, user in zip(indexes, users):
+        results[index].update({"status": "created", "id": user.pk})
+    return results
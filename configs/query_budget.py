@@ -0,0 +1,53 @@
+import re
+from collections import Counter
+from django.conf import settings
+
+IN_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+NUMBER = re.compile(r"\b\d+\b")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(count):
+    """Declare the query budget of a function view (viewsets set a ``query_budget`` attribute)."""
+    def decorator(view):
+        view.query_budget = count
+        return view
+    return decorator
+
+
+def declared_budget(func, method):
+    """Budget a resolved view declares, or None: an int, or a dict keyed by viewset action with an optional "default"."""
+    view = getattr(func, "cls", None) or getattr(func, "view_class", None) or func
+    budget = getattr(view, "query_budget", None)
+    if isinstance(budget, dict):
+        actions = getattr(func, "actions", None) or {}
+        budget = budget.get(actions.get(method.lower()), budget.get("default"))
+    return budget
+
+
+def view_budget(func, method):
+    """Declared budget of a resolved view, else QUERY_BUDGET_DEFAULT."""
+    budget = declared_budget(func, method)
+    return settings.QUERY_BUDGET_DEFAULT if budget is None else budget
+
+
+def sql_shape(sql):
+    """SQL with IN lists and numeric literals folded, so one query per row shows up as one shape."""
+    return NUMBER.sub("N", IN_LIST.sub("(%s...)", sql))
+
+
+def find_problems(statements, budget, repeat_limit=None):
+    """Messages for a query count over budget and for every SQL shape run repeat_limit times or more."""
+    repeat_limit = settings.QUERY_REPEAT_LIMIT if repeat_limit is None else repeat_limit
+    problems = []
+    if len(statements) > budget:
+        problems.append(f"{len(statements)} queries, budget is {budget}")
+
+    for shape, count in Counter(map(sql_shape, statements)).most_common():
+        if count < repeat_limit:
+            break
+        problems.append(f"same query ran {count} times: {shape}")
+    return problems
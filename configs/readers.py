@@ -0,0 +1,95 @@
+import decimal
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() is the identity for values coming
+# straight from the database driver.
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def field_converter(field):
+    """Return convert(value, tz) for a non-null value, specialised for the field's options."""
+    if type(field) is serializers.DateTimeField:
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if settings.USE_TZ and not hasattr(field, "timezone") and output_format and output_format.lower() == ISO_8601:
+            def convert_datetime(value, tz):
+                if not timezone.is_aware(value):
+                    return field.to_representation(value)
+                value = value.astimezone(tz).isoformat()
+                return value[:-6] + "Z" if value.endswith("+00:00") else value
+            return convert_datetime
+
+    if type(field) is serializers.DecimalField:
+        coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        if coerce_to_string and not field.localize and field.decimal_places is not None:
+            quantum = decimal.Decimal(".1") ** field.decimal_places
+            context = decimal.getcontext().copy()
+            if field.max_digits is not None:
+                context.prec = field.max_digits
+
+            def convert_decimal(value, tz):
+                if not isinstance(value, decimal.Decimal):
+                    return field.to_representation(value)
+                return "{:f}".format(value.quantize(quantum, rounding=field.rounding, context=context))
+            return convert_decimal
+
+    return lambda value, tz: field.to_representation(value)
+
+
+class ValuesReader:
+    """Read-only fast path that renders values() rows exactly like a ModelSerializer."""
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.compiled = None
+
+    def compile(self):
+        serializer = self.serializer_class()
+        opts = serializer.Meta.model._meta
+        columns, names, converters = [], [], []
+
+        for field in serializer._readable_fields:
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or not model_field.concrete or getattr(field, "pk_field", None):
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{field.field_name} is not a concrete model field."
+                )
+
+            columns.append(model_field.attname)
+            names.append(field.field_name)
+            if type(field) not in PASSTHROUGH_FIELDS:
+                converters.append((field.field_name, field_converter(field)))
+
+        self.compiled = (columns, list(zip(names, columns)), converters)
+        return self.compiled
+
+    def values(self, queryset):
+        columns = (self.compiled or self.compile())[0]
+        return queryset.values(*columns)
+
+    def to_representation(self, row, tz=None):
+        _, fields, converters = self.compiled or self.compile()
+        if tz is None:
+            tz = timezone.get_current_timezone()
+
+        item = {name: row[column] for name, column in fields}
+        for name, convert in converters:
+            value = item[name]
+            if value is not None:
+                item[name] = convert(value, tz)
+        return item
+
+    def serialize(self, rows):
+        tz = timezone.get_current_timezone()
+        return [self.to_representation(row, tz) for row in rows]
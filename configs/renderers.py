@@ -0,0 +1,36 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Match DRF's JSONRenderer output: "Z" for UTC datetimes and stringified
+# non-str keys. Types orjson does not know (Decimal, timedelta, lazy strings,
+# querysets, ...) fall back to DRF's own encoder.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+encode_default = JSONEncoder().default
+
+
+def dump_json(data, option=ORJSON_OPTIONS):
+    return orjson.dumps(data, default=encode_default, option=option)
+
+
+def json_fragment(data):
+    """Serialize data once so it can be embedded in later responses without re-encoding."""
+    return orjson.Fragment(dump_json(data))
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        option = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        ret = dump_json(data, option)
+
+        # Same as DRF: escape U+2028/U+2029 so the output stays a JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
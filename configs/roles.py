@@ -0,0 +1,59 @@
+from django.conf import settings
+from configs.cache import TTLCache
+from configs.models import UserRole
+
+# One bit per built-in role; a user's capabilities are the OR of their roles.
+ROLE_USER = 1 << 0
+ROLE_MANAGER = 1 << 1
+ROLE_ADMINISTRATOR = 1 << 2
+
+ROLE_BITS = {
+    "user": ROLE_USER,
+    "manager": ROLE_MANAGER,
+    "administrator": ROLE_ADMINISTRATOR,
+}
+
+# user id -> frozenset of role names
+role_cache = TTLCache(settings.ROLE_CACHE_SIZE, settings.ROLE_CACHE_TTL)
+
+
+def get_role_names(user_id):
+    roles = role_cache.get(user_id)
+    if roles is None:
+        roles = frozenset(
+            UserRole.objects.filter(user_id=user_id).values_list("role__rolename", flat=True)
+        )
+        role_cache.set(user_id, roles)
+    return roles
+
+
+async def aget_role_names(user_id):
+    roles = role_cache.get(user_id)
+    if roles is None:
+        rows = UserRole.objects.filter(user_id=user_id).values_list("role__rolename", flat=True)
+        roles = frozenset([name async for name in rows])
+        role_cache.set(user_id, roles)
+    return roles
+
+
+def capabilities_for(role_names):
+    capabilities = 0
+    for name in role_names:
+        capabilities |= ROLE_BITS.get(name, 0)
+    return capabilities
+
+
+def get_capabilities(user):
+    """Resolve the user's capability bitmask once and keep it on the user for the rest of the request."""
+    capabilities = getattr(user, "capabilities", None)
+    if capabilities is None:
+        role_names = getattr(user, "role_names", None)
+        if role_names is None:
+            role_names = get_role_names(user.pk)
+        capabilities = capabilities_for(role_names)
+        user.capabilities = capabilities
+    return capabilities
+
+
+def evict_user_roles(user_id):
+    role_cache.delete(user_id)
@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, OperationalError, connections
+
+# Replica chosen by configs.middleware.replica for the current request, so all of
+# its reads see one snapshot. Everything else (writes, pinned clients, commands,
+# background jobs) reads the primary.
+read_replica = ContextVar("read_replica", default=None)
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class ReplicaMonitor:
+    """Background thread that keeps the list of reachable, caught-up replicas for this process."""
+
+    def __init__(self, aliases):
+        self.aliases = list(aliases)
+        self.usable = []
+        self.lag = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run, name="replica-monitor", daemon=True)
+                self._thread.start()
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                return float(cursor.fetchone()[0])
+        except DatabaseError:
+            return None
+        finally:
+            connection.close()
+
+    def refresh(self):
+        usable = []
+        for alias in self.aliases:
+            lag = self.check(alias)
+            self.lag[alias] = lag
+            if lag is not None and lag <= settings.REPLICA_MAX_LAG:
+                usable.append(alias)
+        self.usable = usable
+
+    def mark_down(self, alias):
+        """Stop choosing a replica that failed a request until the next check finds it healthy."""
+        with self._lock:
+            self.usable = [usable for usable in self.usable if usable != alias]
+            self.lag[alias] = None
+
+    def connect(self, alias):
+        """The alias if its connection works, else None after marking it down."""
+        if alias is None:
+            return None
+        try:
+            connections[alias].ensure_connection()
+        except OperationalError:
+            self.mark_down(alias)
+            return None
+        return alias
+
+    def failed(self, alias):
+        """Whether the request's connection to the replica broke, marking it down if so."""
+        connection = connections[alias]
+        if not connection.errors_occurred or (connection.connection is not None and connection.is_usable()):
+            return False
+        self.mark_down(alias)
+        return True
+
+    def run(self):
+        while True:
+            self.refresh()
+            time.sleep(settings.REPLICA_CHECK_INTERVAL)
+
+    def choose(self):
+        """A random usable replica, or None to read from the primary."""
+        if not self.aliases:
+            return None
+        self.start()
+        usable = self.usable
+        return random.choice(usable) if usable else None
+
+
+replica_monitor = ReplicaMonitor(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """Send request reads to the replica picked for the request and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        replica = read_replica.get()
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,127 @@
+import random
+import secrets
+import time
+import uuid
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from configs.models import User, Role, UserRole
+from engines.models import Module
+from products.cache import evict_all_products
+from products.models import Product
+
+# Every synthetic row is named with this prefix so a rerun can replace it
+SEED_PREFIX = "bench-"
+SEED_ADMIN = f"{SEED_PREFIX}admin"
+
+ADJECTIVES = ("Red", "Blue", "Green", "Large", "Small", "Steel", "Wooden")
+NOUNS = ("Widget", "Gadget", "Bottle", "Chair", "Lamp", "Cable", "Notebook")
+
+
+def copy_rows(model, rows):
+    """COPY dicts of attname -> value into the model's table; missing fields take their defaults."""
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    now = timezone.now()
+    defaults = {}
+    for field in fields:
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            defaults[field.attname] = now
+        elif field.has_default():
+            defaults[field.attname] = field.get_default()
+        else:
+            defaults[field.attname] = None
+
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row.get(field.attname, defaults[field.attname]) for field in fields])
+
+
+def product_rows(count, rng):
+    now = timezone.now()
+    for index in range(count):
+        deleted = rng.random() < 0.05
+        yield {
+            "product_name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}",
+            "barcode": f"{SEED_PREFIX}{index:010d}",
+            "price": Decimal(rng.randint(100, 100000)) / 100,
+            "stock": rng.randint(0, 500),
+            "is_deleted": deleted,
+            "deleted_at": now if deleted else None,
+        }
+
+
+def clear_seed():
+    """Delete the rows of a previous seed, including products created while benchmarking."""
+    # A raw DELETE: nothing references products, and Django's delete() would
+    # fetch every row first.
+    products = Product.objects.filter(barcode__startswith=SEED_PREFIX)
+    products._raw_delete(products.db)
+    evict_all_products()
+    User.objects.filter(username__startswith=SEED_PREFIX).delete()
+    Role.objects.filter(rolename__startswith=SEED_PREFIX).delete()
+    Module.objects.filter(name__startswith=SEED_PREFIX).delete()
+
+
+def seed(products=10000, users=1000, roles=10, roles_per_user=2, modules=10, random_seed=42):
+    """Replace the synthetic dataset; return seconds spent per table, the administrator's token and
+    the users' password, which is random and only kept in memory."""
+    rng = random.Random(random_seed)
+    timings = {}
+
+    def timed(name, func):
+        started = time.perf_counter()
+        func()
+        timings[name] = time.perf_counter() - started
+
+    with transaction.atomic():
+        timed("clear", clear_seed)
+
+        timed("roles", lambda: Role.objects.bulk_create(
+            [Role(rolename=f"{SEED_PREFIX}role-{index}") for index in range(roles)]
+        ))
+        timed("modules", lambda: Module.objects.bulk_create(
+            [
+                Module(name=f"{SEED_PREFIX}module-{index}", installed=rng.random() < 0.5, version="1.0")
+                for index in range(modules)
+            ]
+        ))
+
+        # One hash for everyone keeps seeding fast and lets any seeded user log in.
+        password = secrets.token_urlsafe(16)
+        password_hash = make_password(password)
+        admin_token = str(uuid.uuid4())
+        timed("users", lambda: copy_rows(User, [
+            {
+                "username": SEED_ADMIN if index == 0 else f"{SEED_PREFIX}user-{index}",
+                "email": f"{SEED_PREFIX}{index}@example.com",
+                "password": password_hash,
+                "token": admin_token if index == 0 else str(uuid.uuid4()),
+                "is_active": True,
+            }
+            for index in range(max(users, 1))
+        ]))
+
+        def seed_user_roles():
+            user_ids = dict(User.objects.filter(username__startswith=SEED_PREFIX).order_by("id").values_list("username", "id"))
+            builtin = dict(Role.objects.filter(rolename__in=["user", "administrator"]).values_list("rolename", "id"))
+            extra = list(Role.objects.filter(rolename__startswith=SEED_PREFIX).order_by("id").values_list("id", flat=True))
+            rows = [{"user_id": user_ids.pop(SEED_ADMIN), "role_id": builtin["administrator"]}]
+            for user_id in user_ids.values():
+                rows.append({"user_id": user_id, "role_id": builtin["user"]})
+                for role_id in rng.sample(extra, min(max(roles_per_user - 1, 0), len(extra))):
+                    rows.append({"user_id": user_id, "role_id": role_id})
+            copy_rows(UserRole, rows)
+
+        timed("user_roles", seed_user_roles)
+
+        timed("products", lambda: copy_rows(Product, product_rows(products, rng)))
+
+    with connection.cursor() as cursor:
+        for model in (Role, Module, User, UserRole, Product):
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    return timings, admin_token, password
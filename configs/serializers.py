@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
 from configs.models import User, Role, UserRole
+from configs.roles import evict_user_roles
+from configs.readers import ValuesReader
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
@@ -27,6 +29,7 @@ class UserSerializer(serializers.ModelSerializer):
         for role in valid_roles:
             UserRole.objects.get_or_create(user=user, role=role)
 
+        evict_user_roles(user.pk)
         return user
 
 
@@ -39,7 +42,10 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ["token", "refresh_token"]
 
     def get_role_details(self, obj):
-        roles = obj.userrole_set.all().select_related("role")
+        if hasattr(obj, "role_details"):
+            return obj.role_details
+
+        roles = obj.userrole_set.all().select_related("role").order_by("id")
         return [{"id": role.role.id, "rolename": role.role.rolename} for role in roles]
 
     def update(self, instance, validated_data):
@@ -59,14 +65,27 @@ class UserSerializer(serializers.ModelSerializer):
             UserRole.objects.bulk_create(
                 [UserRole(user=instance, role=role) for role in valid_roles]
             )
+            evict_user_roles(instance.pk)
 
         return instance
 
+class BulkUserSerializer(serializers.Serializer):
+    """Validates one row of a bulk user create; uniqueness is checked for the whole batch at once."""
+
+    username = serializers.CharField(max_length=255)
+    email = serializers.EmailField(max_length=254)
+    password = serializers.CharField(write_only=True)
+    roles = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    is_active = serializers.BooleanField(default=True)
+
+
 class RoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ["id", "rolename", "created_at", "updated_at"]
 
+role_reader = ValuesReader(RoleSerializer)
+
 class UserRoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserRole
@@ -11,7 +11,10 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
+import copy
 import os
+import tempfile
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -42,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework.authtoken',
     "drf_spectacular",
     'rest_framework',
@@ -60,14 +64,71 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'configs.authentication.CustomTokenAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'configs.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'configs.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'configs.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv("PAGE_SIZE", "100")),
 }
 
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+
+# Rows fetched per round trip by the server-side cursor of streaming exports
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Product search: deepest offset a client may page to through ranked results
+SEARCH_MAX_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "1000"))
+
+# Bulk write endpoints: rows accepted per request and rows per INSERT statement
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "5000"))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
+
+# Per-worker barcode -> product payload cache behind products/get/barcode/{barcode}
+BARCODE_CACHE_SIZE = int(os.getenv("BARCODE_CACHE_SIZE", "4096"))
+BARCODE_CACHE_TTL = int(os.getenv("BARCODE_CACHE_TTL", "30"))
+
+# Recycle bin purge: hours a soft-deleted product is kept, rows per DELETE and
+# seconds between runs of `manage.py purge_recycle_bin --loop`
+RECYCLE_BIN_RETENTION_HOURS = int(os.getenv("RECYCLE_BIN_RETENTION_HOURS", "24"))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+PURGE_INTERVAL = int(os.getenv("PURGE_INTERVAL", "300"))
+
+# Threads per process hashing passwords during bulk user provisioning (0 = one per CPU)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0")) or os.cpu_count() or 1
+
+# Async login: threads checking passwords per process, and how many more logins
+# may wait for one before new ones are turned away with 503
+LOGIN_HASH_WORKERS = int(os.getenv("LOGIN_HASH_WORKERS", "0")) or os.cpu_count() or 1
+LOGIN_HASH_QUEUE = int(os.getenv("LOGIN_HASH_QUEUE", "32"))
+
+# Background CSV product imports, run by `manage.py run_imports --loop`: seconds
+# between polls for pending jobs
+IMPORT_POLL_INTERVAL = float(os.getenv("IMPORT_POLL_INTERVAL", "2"))
+
+# Per-worker token -> user cache used by CustomTokenAuthentication
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "30"))
+# Seconds between a worker's checks of the user and role tables for changes
+# made elsewhere (one small query); cache hits in between run no query
+TOKEN_CACHE_CHECK_INTERVAL = float(os.getenv("TOKEN_CACHE_CHECK_INTERVAL", "1"))
+
+# Per-worker user -> role names cache used by the permission classes
+ROLE_CACHE_SIZE = int(os.getenv("ROLE_CACHE_SIZE", "1024"))
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "30"))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Django Modular App',
     'DESCRIPTION': 'List Endpoint Django Modular Base',
     'VERSION': '1.0.0',
     'AUTHOR': 'Daud Yusup',
     'SERVE_INCLUDE_SCHEMA': False,
+    'DEFAULT_GENERATOR_CLASS': 'configs.schema.SchemaGenerator',
     'SECURITY_DEFINITIONS': {
         'CustomTokenAuth': {
             'type': 'apiKey',
@@ -79,9 +140,13 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    'configs.middleware.metrics.Middleware',
+    'configs.middleware.query_budget.Middleware',
+    'configs.middleware.profiling.Middleware',
     'corsheaders.middleware.CorsMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "configs.middleware.static_files.Middleware",
     'django.middleware.security.SecurityMiddleware',
+    'configs.middleware.replica.Middleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,12 +157,45 @@ MIDDLEWARE = [
     'configs.middleware.blocked_module.Middleware',
 ]
 
+# Request metrics: every worker writes its counters to METRICS_DIR each
+# METRICS_FLUSH_INTERVAL seconds and /services/metrics sums them; files not
+# updated for METRICS_RETENTION seconds are dropped. Scrapers may authenticate
+# with "Authorization: Bearer <METRICS_TOKEN>" instead of a manager token.
+METRICS_DIR = os.getenv("METRICS_DIR") or os.path.join(tempfile.gettempdir(), "django-modular-app-metrics")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+METRICS_RETENTION = int(os.getenv("METRICS_RETENTION", "86400"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+# Query budgets for dev/test: with QUERY_BUDGET "log" or "raise", a request that
+# runs more queries than its view's query_budget (QUERY_BUDGET_DEFAULT when the
+# view declares none) or runs one SQL shape QUERY_REPEAT_LIMIT times is reported.
+QUERY_BUDGET = os.getenv("QUERY_BUDGET", "off")
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "10"))
+QUERY_REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", "3"))
+
+# Per-request profiling: an administrator's request with an "X-Profile" header
+# ("cprofile" or "sample") is profiled with tracemalloc and an SQL timeline. The
+# newest PROFILE_KEEP profiles are kept in PROFILE_DIR and served from
+# /services/profiles; the response carries their id in "X-Profile-Id".
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "django-modular-app-profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "1"))
+
+# Seconds a worker trusts its cached module install state before checking it
+# against the module table's version (one small query)
+MODULE_STATE_CHECK_INTERVAL = float(os.getenv("MODULE_STATE_CHECK_INTERVAL", "1"))
+
 CORS_ALLOWED_ORIGINS = [
     "https://nextjs-modular-app.vercel.app",
     "https://web-production-575d7.up.railway.app",
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+# Lets browser clients read and send back the read-your-writes pin of
+# configs.middleware.replica
+CORS_EXPOSE_HEADERS = ["X-Primary-Pin"]
+CORS_ALLOW_HEADERS = (*default_headers, "x-primary-pin")
 
 
 AUTHENTICATION_BACKENDS = [
@@ -140,9 +238,45 @@ DATABASES = {
         'PASSWORD': os.getenv("DB_PASSWORD"),
         'HOST': os.getenv("DB_HOST"),
         'PORT': os.getenv("DB_PORT", "5432"),  # Default ke 5432 jika tidak ada di .env
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Per-process psycopg connection pool (sizes in connections, times in seconds);
+# CONN_HEALTH_CHECKS makes the pool check each connection as it is handed out.
+# With DB_POOL=0, connections are kept for DB_CONN_MAX_AGE seconds instead.
+DB_POOL = os.getenv("DB_POOL", "1") == "1"
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            'max_size': int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            'timeout': float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            'max_lifetime': float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            'max_idle': float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+
+# Read replicas: comma-separated host[:port] list sharing the primary's name and
+# credentials. Safe-method requests read from a replica whose lag is at most
+# REPLICA_MAX_LAG seconds (checked every REPLICA_CHECK_INTERVAL seconds, and dropped
+# as soon as a request fails on it); a client reads from the primary for
+# REPLICA_PIN_SECONDS after each of its writes (see configs.middleware.replica).
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    host, _, port = address.strip().partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = copy.deepcopy(DATABASES['default'])
+    DATABASES[alias].update({'HOST': host, 'PORT': port or DATABASES['default']['PORT'], 'TEST': {'MIRROR': 'default'}})
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['configs.routers.ReplicaRouter']
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "10"))
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -1,6 +1,7 @@
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
-from configs.models import Role  
+from configs.models import Role, User, UserRole
+from configs.roles import evict_user_roles, role_cache
 
 @receiver(post_migrate)
 def create_default_roles(sender, **kwargs):
@@ -8,4 +9,16 @@ def create_default_roles(sender, **kwargs):
         default_roles = ["user", "manager", "administrator"]
         for role in default_roles:
             Role.objects.get_or_create(rolename=role)
-        print("default roles has been added !")
\ No newline at end of file
+        print("default roles has been added !")
+
+@receiver([post_save, post_delete], sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    evict_user_roles(instance.pk)
+
+@receiver([post_save, post_delete], sender=UserRole)
+def evict_cached_user_roles(sender, instance, **kwargs):
+    evict_user_roles(instance.user_id)
+
+@receiver([post_save, post_delete], sender=Role)
+def evict_cached_roles(sender, **kwargs):
+    role_cache.clear()
@@ -0,0 +1,87 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from configs.endpoints import get_endpoints
+from configs.management.commands.check_query_budgets import clear_caches, drain_response
+from configs.models import User, Role, UserRole
+from configs.query_budget import declared_budget, find_problems, view_budget
+from configs.serializers import UserSerializer
+from engines.models import Module
+from products.models import Product, ProductImportJob
+
+TOKEN = "query-budget-token"
+
+
+class QueryBudgetTests(TestCase):
+    """Every GET route check_query_budgets walks stays within its view's query budget with cold and warm caches,
+    and a read view that declares its budget runs exactly it with cold caches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="budget", email="budget@example.com", password="!", token=TOKEN)
+        UserRole.objects.bulk_create([UserRole(user=cls.user, role=role) for role in Role.objects.all()])
+        Module.objects.filter(name="products").update(installed=True)
+        Product.objects.bulk_create([
+            Product(product_name=f"Budget product {index}", barcode=f"budget-{index}", price="1.00", stock=index)
+            for index in range(5)
+        ])
+        ProductImportJob.objects.create(file_name="budget.csv")
+
+    def setUp(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Token {TOKEN}"
+
+    def get(self, path):
+        response = self.client.get(path)
+        drain_response(response)
+        return response
+
+    def assertBudget(self, path, match):
+        budget = view_budget(match.func, "GET")
+        clear_caches()
+        # Some GET routes write (module install/uninstall), so each one runs
+        # in its own savepoint against the same starting data.
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as cold:
+                response = self.get(path)
+            with CaptureQueriesContext(connection) as warm:
+                self.get(path)
+            transaction.set_rollback(True)
+
+        if response.status_code == 405:
+            return
+        self.assertLess(response.status_code, 500)
+        self.assertEqual(find_problems([query["sql"] for query in cold.captured_queries], budget), [])
+        self.assertLessEqual(len(warm), budget)
+        if response.status_code == 200 and declared_budget(match.func, "GET") is not None:
+            self.assertEqual(len(cold), budget)
+
+    def test_every_route(self):
+        endpoints = get_endpoints()
+        self.assertIn("products:import-product-detail", {match.view_name for _, match in endpoints})
+        for path, match in endpoints:
+            with self.subTest(path=path, view=match.view_name):
+                self.assertBudget(path, match)
+
+
+class RoleDetailsTests(TestCase):
+    """with_role_details loads every user's roles in the user query itself."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.roles = list(Role.objects.order_by("id"))
+        cls.users = [
+            User.objects.create(username=f"roles-{index}", email=f"roles-{index}@example.com", password="!")
+            for index in range(3)
+        ]
+        UserRole.objects.bulk_create([UserRole(user=user, role=role) for user in cls.users for role in cls.roles])
+
+    def test_one_query_for_users_with_several_roles(self):
+        expected = [{"id": role.pk, "rolename": role.rolename} for role in self.roles]
+        self.assertGreater(len(expected), 1)
+
+        with self.assertNumQueries(1):
+            data = UserSerializer(User.objects.with_role_details().filter(username__startswith="roles-"), many=True).data
+
+        self.assertEqual(len(data), len(self.users))
+        for user in data:
+            self.assertEqual(user["role_details"], expected)
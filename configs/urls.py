@@ -17,7 +17,8 @@ Including another URLconf
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
-from configs.views import GetRoleViewSet, GetUserRoleViewSet, HomePage, ErrorPage, LoginViewSet, LogoutViewSet, GetUserViewSet, CreateUserViewSet, DeleteUserViewSet, UpdateUserViewSet
+from configs import async_views
+from configs.views import GetUserRoleViewSet, HomePage, ErrorPage, GetUserViewSet, CreateUserViewSet, DeleteUserViewSet, UpdateUserViewSet, MetricsView, ProfileViewSet
 from engines.urls import engines_urlpatterns
 from products.urls import products_urlpatterns
 
@@ -28,18 +29,25 @@ handler404 = lambda request, exception: ErrorPage(request, exception, 404)
 handler500 = lambda request: ErrorPage(request, None, 500)
 
 router = DefaultRouter(trailing_slash=False)
-router.register(r'roles/get', GetRoleViewSet, basename='roles')
 router.register(r'user-roles/get', GetUserRoleViewSet, basename='user-roles' )
 router.register(r'users/get', GetUserViewSet, basename='users')
 router.register(r'users/create', CreateUserViewSet, basename='create-user')
 router.register(r'users/delete', DeleteUserViewSet, basename='delete-user')
 router.register(r'users/update', UpdateUserViewSet, basename='update-user')
-router.register(r'users/login', LoginViewSet, basename='login-user')
-router.register(r'users/logout', LogoutViewSet, basename='logout-user')
+router.register(r'profiles', ProfileViewSet, basename='profiles')
 
 urlpatterns = [
     path("", HomePage, name="homepage"),
 
+    # Async views, documented from their async_api_view / configs.schema.document
+    # arguments by configs.schema.SchemaGenerator.
+    path("services/users/login", async_views.login, name="async-login"),
+    path("services/users/logout", async_views.logout, name="async-logout"),
+    path("services/roles/get/all", async_views.all_roles, name="async-roles-all"),
+    path("services/roles/get/<int:pk>", async_views.retrieve_role, name="async-role"),
+
+    path("services/metrics", MetricsView.as_view(), name="metrics"),
+
     path('services/', include(router.urls)),
     path("services/", include((engines_urlpatterns, "engines"), namespace="engines")),
     path("services/", include((products_urlpatterns, "products"), namespace="products")),
@@ -1,22 +1,124 @@
+import hashlib
+from functools import wraps
+from django.db import DataError
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework.response import Response
-from rest_framework.views import exception_handler
+from rest_framework.views import exception_handler, set_rollback
 from rest_framework import status
+from configs.renderers import dump_json
 
-def success_response(data, message="Request successful", code=200):
-    return Response({
+STREAM_BATCH_SIZE = 500
+
+def success_body(data, message="Request successful", code=200, pagination=None):
+    body = {
         "data": data,
         "status": "success",
         "code": code,
         "messages": message
-    }, status=code)
+    }
+    if pagination is not None:
+        body["pagination"] = pagination
+    return body
 
-def error_response(message="Request failed", code=400, data=None):
-    return Response({
+def error_body(message="Request failed", code=400, data=None):
+    return {
         "data": data,
         "status": "error",
         "code": code,
         "messages": message
-    }, status=code)
+    }
+
+def success_response(data, message="Request successful", code=200, pagination=None):
+    return Response(success_body(data, message, code, pagination), status=code)
+
+def error_response(message="Request failed", code=400, data=None):
+    return Response(error_body(message, code, data), status=code)
+
+def json_response(body, code=200):
+    """Envelope response for plain (non-DRF) views, such as the async endpoints."""
+    return HttpResponse(dump_json(body), status=code, content_type="application/json")
+
+def conditional_get(validator):
+    """Let a viewset GET handler answer If-None-Match / If-Modified-Since with 304.
+
+    ``validator(request, *args, **kwargs)`` returns ``(version, last_modified)`` and
+    must be far cheaper than the handler; it runs before anything is serialized.
+    """
+    def get_validators(request, *args, **kwargs):
+        validators = getattr(request, "_conditional_validators", None)
+        if validators is None:
+            version, last_modified = validator(request, *args, **kwargs)
+            etag = conditional_etag(request, version)
+            validators = (etag, last_modified)
+            request._conditional_validators = validators
+        return validators
+
+    def etag(request, *args, **kwargs):
+        return get_validators(request, *args, **kwargs)[0]
+
+    def last_modified(request, *args, **kwargs):
+        return get_validators(request, *args, **kwargs)[1]
+
+    def decorator(view_method):
+        view_method = method_decorator(condition(etag_func=etag, last_modified_func=last_modified))(view_method)
+        return method_decorator(cache_control(private=True, no_cache=True))(view_method)
+
+    return decorator
+
+def conditional_etag(request, version):
+    return hashlib.md5(f"{request.get_full_path()}|{version}".encode()).hexdigest()
+
+def async_conditional_get(validator):
+    """conditional_get for async function views; ``validator`` is a coroutine function."""
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            version, last_modified = await validator(request, *args, **kwargs)
+            etag = quote_etag(conditional_etag(request, version))
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if timestamp and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(timestamp)
+                response.headers.setdefault("ETag", etag)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return inner
+
+    return decorator
+
+async def ndjson_stream(items, batch_size=STREAM_BATCH_SIZE):
+    batch = []
+    async for item in items:
+        batch.append(dump_json(item))
+        if len(batch) >= batch_size:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+async def json_array_stream(items, batch_size=STREAM_BATCH_SIZE):
+    yield b"["
+    separator = b""
+    batch = []
+    async for item in items:
+        batch.append(dump_json(item))
+        if len(batch) >= batch_size:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
+    yield b"]"
 
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
@@ -30,4 +132,10 @@ def custom_exception_handler(exc, context):
         }
         return Response(custom_response_data, status=response.status_code)
 
+    # A value the serializers accept but the column cannot hold, such as a
+    # stock total pushed past the integer range.
+    if isinstance(exc, DataError):
+        set_rollback()
+        return error_response(str(exc).splitlines()[0], code=status.HTTP_400_BAD_REQUEST)
+
     return response
@@ -0,0 +1,32 @@
+from django.db.models import Count, IntegerField, Max, Value
+
+
+def versions_query(sources):
+    """Row count and newest updated_at of each model (whole table) or queryset, in one UNION ALL query."""
+    parts = [
+        (source._base_manager.all() if isinstance(source, type) else source.all())
+        .order_by()
+        .annotate(source=Value(index, output_field=IntegerField()))
+        .values("source")
+        .annotate(rows=Count("pk"), updated=Max("updated_at"))
+        .values_list("source", "rows", "updated")
+        for index, source in enumerate(sources)
+    ]
+    return parts[0].union(*parts[1:], all=True)
+
+def combine_versions(rows):
+    rows = sorted(rows)
+    version = tuple((count, updated) for _, count, updated in rows)
+    last_modified = max((updated for _, _, updated in rows if updated is not None), default=None)
+    return version, last_modified
+
+def table_version(*sources):
+    """(row count, newest updated_at) of each source, as a one-query conditional_get validator.
+
+    Derived from the rows themselves so writers never share a counter row: a
+    delete changes the count, an insert or update moves updated_at.
+    """
+    return combine_versions(versions_query(sources))
+
+async def atable_version(*sources):
+    return combine_versions([row async for row in versions_query(sources)])
@@ -1,18 +1,23 @@
-import uuid
-from django.contrib.auth.hashers import check_password
+from django.conf import settings
+from django.http import HttpResponse, FileResponse
 from django.shortcuts import render, get_object_or_404
 from rest_framework import viewsets, mixins, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from configs.models import User, Role, UserRole
-from configs.serializers import LoginSerializer, UserSerializer, RoleSerializer, UserRoleSerializer
-from configs.permissions import UserPermission
-from django.db import transaction
+from configs.serializers import UserSerializer, BulkUserSerializer, UserRoleSerializer
+from configs.permissions import UserPermission, MetricsPermission, AdministratorPermission
+from django.db import IntegrityError, transaction
 from rest_framework.exceptions import ValidationError
 from django.core.exceptions import ObjectDoesNotExist
-from configs.utils import success_response, error_response
+from configs.utils import success_response, error_response, conditional_get
+from configs.versions import table_version
+from configs.provisioning import provision_users
+from configs.metrics import render_metrics
+from configs.profiling import list_profiles, load_profile, profile_download
 
 # Render home page
 def HomePage(request):
@@ -24,194 +29,10 @@ def ErrorPage(request, exception=None, status_code=500):
     context = {"status_code": status_code, "error_message": error_message}
     return render(request, "error.html", context, status=status_code)
 
-# AUTHENTICATION SERVICE START
-
-class LoginViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
-    serializer_class = LoginSerializer
-    permission_classes = [AllowAny]
-
-    @extend_schema(
-        operation_id="login_user",
-        tags=["Auth Services"],
-        description="Authenticate user and generate token.",
-        request=LoginSerializer,
-        responses={
-            200: {
-                "data": {
-                    "token": "string",
-                    "refresh_token": "string",
-                    "user": {
-                        "id": "integer",
-                        "username": "string",
-                        "email": "string",
-                    },
-                },
-                "status": "success",
-                "code": 200,
-                "messages": "Login successful",
-            },
-            401: {
-                "data": None,
-                "status": "error",
-                "code": 401,
-                "messages": "Invalid credentials",
-            },
-        },
-    )
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        if serializer.is_valid():
-            username = serializer.validated_data["username"]
-            password = serializer.validated_data["password"]
-            
-            try:
-                user = User.objects.get(username=username)
-            except User.DoesNotExist:
-                return error_response(
-                    message="Invalid credentials",
-                    code=status.HTTP_401_UNAUTHORIZED
-                )
-
-            if not check_password(password, user.password):
-                return error_response(
-                    message="Invalid credentials",
-                    code=status.HTTP_401_UNAUTHORIZED
-                )
-
-            token = str(uuid.uuid4())
-            refresh_token = str(uuid.uuid4())
-            user.token = token
-            user.refresh_token = refresh_token
-            user.save()
-
-            return success_response(
-                data={
-                    "token": token,
-                    "refresh_token": refresh_token,
-                    "user": {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                    },
-                },
-                message="Login successful",
-                code=status.HTTP_200_OK
-            )
-
-        return error_response(
-            message="Invalid input",
-            code=status.HTTP_400_BAD_REQUEST,
-            data=serializer.errors
-        )
-
-class LogoutViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
-    permission_classes = [AllowAny]
-
-    @extend_schema(
-        operation_id="logout_user",
-        tags=["Auth Services"],
-        description="Logout user and clear token.",
-        request={"application/json": {"example": {"token": "user-token"}}},
-        responses={
-            200: {
-                "data": None,
-                "status": "success",
-                "code": 200,
-                "messages": "Logged out successfully",
-            },
-            400: {
-                "data": None,
-                "status": "error",
-                "code": 400,
-                "messages": "Token is required",
-            },
-            401: {
-                "data": None,
-                "status": "error",
-                "code": 401,
-                "messages": "Invalid token",
-            },
-        },
-    )
-    def create(self, request, *args, **kwargs):
-        token = request.data.get("token")
-
-        if not token:
-            return error_response(
-                message="Token is required",
-                code=status.HTTP_400_BAD_REQUEST
-            )
-
-        try:
-            user = User.objects.get(token=token)
-        except User.DoesNotExist:
-            return error_response(
-                message="Invalid token",
-                code=status.HTTP_401_UNAUTHORIZED
-            )
-
-        user.token = None
-        user.refresh_token = None
-        user.save()
-
-        return success_response(
-            data=None,
-            message="Logged out successfully",
-            code=status.HTTP_200_OK
-        )
-
-# AUTHENTICATION SERVICE END
-
 # ROLES SERVICE START
 
-@extend_schema_view(
-    retrieve=extend_schema(
-        operation_id="get_roles_by_id",
-        tags=["Roles Services"],
-        description="Retrieve a specific role by ID.",
-    ),
-)
-class GetRoleViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
-    queryset = Role.objects.all()
-    serializer_class = RoleSerializer
-    permission_classes = [UserPermission]
-
-    def retrieve(self, request, *args, **kwargs):
-        role = self.queryset.filter(pk=kwargs["pk"]).first()
-        if not role:
-            return error_response(
-                message="Role not found",
-                code=status.HTTP_404_NOT_FOUND
-            )
-
-        serializer = self.get_serializer(role)
-        return success_response(
-            data=serializer.data,
-            message="Role retrieved successfully",
-            code=status.HTTP_200_OK
-        )
-
-    @extend_schema(
-        operation_id="get_all_roles",
-        tags=["Roles Services"],
-        description="Retrieve all roles.",
-    )
-    @action(detail=False, methods=["get"], url_path="all")
-    def all_roles(self, request):
-        queryset = self.get_queryset()
-        if not queryset.exists():
-            return error_response(
-                message="No roles available",
-                code=status.HTTP_204_NO_CONTENT
-            )
-
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(
-            data=serializer.data,
-            message="Roles retrieved successfully",
-            code=status.HTTP_200_OK
-        )
-
+def user_roles_version(request, *args, **kwargs):
+    return table_version(UserRole)
 
 @extend_schema_view(
     retrieve=extend_schema(
@@ -224,10 +45,12 @@ class GetUserRoleViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = UserRole.objects.all()
     serializer_class = UserRoleSerializer
     permission_classes = [IsAuthenticated, UserPermission]
+    query_budget = 3
 
+    @conditional_get(user_roles_version)
     def retrieve(self, request, *args, **kwargs):
-        user_roles = self.queryset.filter(user_id=kwargs["pk"])
-        if not user_roles.exists():
+        user_roles = list(self.queryset.filter(user_id=kwargs["pk"]))
+        if not user_roles:
             return error_response(
                 message="User roles not found",
                 code=status.HTTP_404_NOT_FOUND
@@ -246,25 +69,30 @@ class GetUserRoleViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
         description="Retrieve all user roles.",
     )
     @action(detail=False, methods=["get"], url_path="all")
+    @conditional_get(user_roles_version)
     def all_user_roles(self, request):
-        queryset = self.get_queryset()
-        if not queryset.exists():
+        page = self.paginate_queryset(self.get_queryset())
+        if not page:
             return error_response(
                 message="No user roles available",
                 code=status.HTTP_204_NO_CONTENT
             )
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(page, many=True)
         return success_response(
             data=serializer.data,
             message="User roles retrieved successfully",
-            code=status.HTTP_200_OK
+            code=status.HTTP_200_OK,
+            pagination=self.paginator.get_pagination_meta()
         )
 
 # ROLES SERVICE END
 
 # USER SERVICE START
 
+def users_version(request, *args, **kwargs):
+    return table_version(User, UserRole, Role)
+
 class CreateUserViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
@@ -388,6 +216,38 @@ class CreateUserViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @extend_schema(
+        operation_id="bulk_create_users",
+        tags=["Users Services"],
+        description="Create many users with role assignment in one request; reports a result per row.",
+        request=BulkUserSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated, UserPermission])
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return error_response("Request body must be a non-empty list of users.", code=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.BULK_MAX_ROWS:
+            return error_response(f"At most {settings.BULK_MAX_ROWS} users per request.", code=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = provision_users(rows)
+        except IntegrityError:
+            return error_response(
+                "Some users were created concurrently by another request. Please retry.",
+                code=status.HTTP_409_CONFLICT
+            )
+
+        created = sum(1 for result in results if result["status"] == "created")
+        if not created:
+            return error_response("No valid users to create.", code=status.HTTP_400_BAD_REQUEST, data=results)
+
+        return success_response(
+            results,
+            f"{created} user(s) created, {len(results) - created} failed.",
+            code=status.HTTP_201_CREATED
+        )
+
 
 @extend_schema_view(
     retrieve=extend_schema(
@@ -397,10 +257,12 @@ class CreateUserViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     ),
 )
 class GetUserViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.with_role_details()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, UserPermission]
+    query_budget = 3
 
+    @conditional_get(users_version)
     def retrieve(self, request, *args, **kwargs):
         try:
             user = self.get_queryset().get(pk=kwargs["pk"])
@@ -431,26 +293,29 @@ class GetUserViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
         description="Retrieve all users.",
     )
     @action(detail=False, methods=["get"], url_path="all")
+    @conditional_get(users_version)
     def all_users(self, request):
-        queryset = self.get_queryset()
-        if not queryset.exists():
+        page = self.paginate_queryset(self.get_queryset())
+        if not page:
             return Response(
                 {
                     "data": [],
                     "status": "success",
                     "code": 200,
-                    "messages": "No users available."
+                    "messages": "No users available.",
+                    "pagination": self.paginator.get_pagination_meta()
                 },
                 status=status.HTTP_200_OK
             )
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(page, many=True)
         return Response(
             {
                 "data": serializer.data,
                 "status": "success",
                 "code": 200,
-                "messages": "Users retrieved successfully."
+                "messages": "Users retrieved successfully.",
+                "pagination": self.paginator.get_pagination_meta()
             },
             status=status.HTTP_200_OK
         )
@@ -631,3 +496,42 @@ class DeleteUserViewSet(mixins.DestroyModelMixin, viewsets.GenericViewSet):
         )
 
 # USER SERVICE END
+
+# METRICS SERVICE START
+
+class MetricsView(APIView):
+    permission_classes = [MetricsPermission]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# METRICS SERVICE END
+
+# PROFILING SERVICE START
+
+class ProfileViewSet(viewsets.ViewSet):
+    permission_classes = [AdministratorPermission]
+    lookup_value_regex = r"[A-Za-z0-9_-]+"
+
+    @extend_schema(exclude=True)
+    def list(self, request):
+        return success_response(list_profiles(), "Profiles retrieved successfully")
+
+    @extend_schema(exclude=True)
+    def retrieve(self, request, pk=None):
+        profile = load_profile(pk)
+        if profile is None:
+            return error_response("Profile not found", status.HTTP_404_NOT_FOUND)
+        return success_response(profile, "Profile retrieved successfully")
+
+    @extend_schema(exclude=True)
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        download = profile_download(pk)
+        if download is None:
+            return error_response("Profile not found", status.HTTP_404_NOT_FOUND)
+        path, filename = download
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=filename)
+
+# PROFILING SERVICE END
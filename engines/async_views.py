@@ -0,0 +1,27 @@
+from configs.async_api import async_api_view
+from configs.query_budget import query_budget
+from configs.utils import json_response, success_body, error_body, async_conditional_get
+from configs.versions import atable_version
+from engines.models import Module
+from engines.serializers import ModuleSerializer, module_reader
+
+
+async def modules_version(request, *args, **kwargs):
+    return await atable_version(Module)
+
+
+@query_budget(4)
+@async_api_view(
+    operation_id="get_installed_modules",
+    tags=["Module Services"],
+    description="Retrieve all installed modules.",
+    responses=ModuleSerializer(many=True),
+)
+@async_conditional_get(modules_version)
+async def installed_modules(request):
+    rows = module_reader.values(Module.objects.filter(installed=True))
+    modules = module_reader.serialize([row async for row in rows])
+    if not modules:
+        return json_response(error_body("No installed modules available", 404), 404)
+
+    return json_response(success_body(modules, "Installed modules retrieved successfully"))
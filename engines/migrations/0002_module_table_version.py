@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configs', '0003_table_version'),
+        ('engines', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE TRIGGER tabel_engine_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+            "ON tabel_engine_data FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();",
+            "DROP TRIGGER tabel_engine_data_version ON tabel_engine_data;",
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engines', '0002_module_table_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "DROP TRIGGER tabel_engine_data_version ON tabel_engine_data;",
+            "CREATE TRIGGER tabel_engine_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+            "ON tabel_engine_data FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();",
+        ),
+        migrations.AddField(
+            model_name='module',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
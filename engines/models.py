@@ -4,6 +4,7 @@ class Module(models.Model):
     name = models.CharField(max_length=255, unique=True)
     installed = models.BooleanField(default=False)
     version = models.CharField(max_length=50, default="1.0")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "tabel_engine_data"
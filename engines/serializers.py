@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from engines.models import Module
+from configs.readers import ValuesReader
 
 class ModuleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Module
         fields = ["id", "name", "installed", "version"]
+
+
+module_reader = ValuesReader(ModuleSerializer)
@@ -1,8 +1,9 @@
 from django.apps import apps
 from django.conf import settings
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
 from engines.models import Module
+from engines.state import invalidate_module_state
 
 EXCLUDED_APPS = {
     'django.contrib.admin',
@@ -11,6 +12,7 @@ EXCLUDED_APPS = {
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
@@ -32,4 +34,9 @@ def detect_and_save_modules(sender, **kwargs):
 
     if modules_to_create:
         Module.objects.bulk_create(modules_to_create)
+        invalidate_module_state()
         print(f"Added {len(modules_to_create)} new modules to the database.")
+
+@receiver([post_save, post_delete], sender=Module)
+def refresh_module_state(sender, **kwargs):
+    invalidate_module_state()
@@ -0,0 +1,67 @@
+import time
+from django.conf import settings
+from configs.versions import atable_version, combine_versions, table_version
+from engines.models import Module
+
+# Per-worker snapshot of Module.name -> Module.installed and the table version
+# it was read at. At most once per MODULE_STATE_CHECK_INTERVAL seconds a request
+# compares that version with the table's, so an install or uninstall in any
+# worker is seen within the interval; this worker's own changes drop it at once.
+_snapshot = None
+_version = None
+_checked_at = 0.0
+
+
+def is_fresh():
+    return time.monotonic() - _checked_at < settings.MODULE_STATE_CHECK_INTERVAL
+
+
+def store_module_state(rows):
+    """Snapshot the (name, installed, updated_at) rows along with the table_version they amount to."""
+    global _snapshot, _version, _checked_at
+    _snapshot = {name: installed for name, installed, _ in rows}
+    _version = combine_versions([(0, len(rows), max((updated for _, _, updated in rows), default=None))])
+    _checked_at = time.monotonic()
+    return _snapshot
+
+
+def confirm_module_state(version):
+    """Keep the snapshot for another interval if the table has not changed since it was read."""
+    global _checked_at
+    if version != _version:
+        return False
+    _checked_at = time.monotonic()
+    return True
+
+
+def module_rows():
+    return Module.objects.values_list("name", "installed", "updated_at")
+
+
+def get_module_state():
+    if _snapshot is not None and (is_fresh() or confirm_module_state(table_version(Module))):
+        return _snapshot
+    return store_module_state(list(module_rows()))
+
+
+async def aget_module_state():
+    if _snapshot is not None and (is_fresh() or confirm_module_state(await atable_version(Module))):
+        return _snapshot
+    return store_module_state([row async for row in module_rows()])
+
+
+def is_module_blocked(name):
+    if not name:
+        return False
+    return get_module_state().get(name) is False
+
+
+async def ais_module_blocked(name):
+    if not name:
+        return False
+    return (await aget_module_state()).get(name) is False
+
+
+def invalidate_module_state():
+    global _snapshot, _version
+    _snapshot = _version = None
@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from engines import async_views
 from engines.views import (
     GetModuleViewSet,
     InstallModuleViewSet, UninstallModuleViewSet, UpgradeModuleViewSet
@@ -12,6 +13,8 @@ router.register(r'modules/install', InstallModuleViewSet, basename='install-modu
 router.register(r'modules/uninstall', UninstallModuleViewSet, basename='uninstall-module')
 router.register(r'modules/upgrade', UpgradeModuleViewSet, basename='upgrade-module')
 
+# Async reads; configs.schema.SchemaGenerator documents them from their async_api_view arguments.
 engines_urlpatterns = [
+    path('modules/active', async_views.installed_modules, name='async-get-installed-modules'),
     path('', include(router.urls)),
 ]
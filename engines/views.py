@@ -2,13 +2,16 @@ from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from engines.models import Module
-from configs.utils import success_response, error_response
-from engines.serializers import ModuleSerializer
+from configs.utils import success_response, error_response, conditional_get
+from configs.versions import table_version
+from engines.serializers import ModuleSerializer, module_reader
 from configs.permissions import EnginePermission
 
+def modules_version(request, *args, **kwargs):
+    return table_version(Module)
+
 # 🔹 GET MODULE
 @extend_schema_view(
     retrieve=extend_schema(
@@ -21,7 +24,9 @@ class GetModuleViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
     permission_classes = [EnginePermission]
+    query_budget = 4
 
+    @conditional_get(modules_version)
     def retrieve(self, request, *args, **kwargs):
         module = self.queryset.filter(pk=kwargs["pk"]).first()
         if not module:
@@ -40,35 +45,17 @@ class GetModuleViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
         description="Retrieve all modules.",
     )
     @action(detail=False, methods=["get"], url_path="all")
+    @conditional_get(modules_version)
     def get_all_modules(self, request):
-        modules = self.get_queryset()
-        if not modules.exists():
+        modules = self.paginate_queryset(module_reader.values(self.get_queryset()))
+        if not modules:
             return error_response("No modules available", status.HTTP_204_NO_CONTENT)
 
-        serializer = self.get_serializer(modules, many=True)
         return success_response(
-            data=serializer.data,
+            data=module_reader.serialize(modules),
             message="Modules retrieved successfully",
-            code=status.HTTP_200_OK
-        )
-
-    @extend_schema(
-        operation_id="get_installed_modules",
-        tags=["Module Services"],
-        description="Retrieve all installed modules.",
-    )
-    @action(detail=False, methods=["get"], url_path="active", permission_classes=[AllowAny])  
-    def get_installed_modules(self, request):
-        modules = self.get_queryset().filter(installed=True)
-
-        if not modules.exists():
-            return error_response("No installed modules available", status.HTTP_404_NOT_FOUND)
-
-        serializer = self.get_serializer(modules, many=True)
-        return success_response(
-            data=serializer.data,
-            message="Installed modules retrieved successfully",
-            code=status.HTTP_200_OK
+            code=status.HTTP_200_OK,
+            pagination=self.paginator.get_pagination_meta()
         )
 
 
@@ -83,6 +70,7 @@ class GetModuleViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
 class InstallModuleViewSet(viewsets.ViewSet):
     serializer_class = ModuleSerializer
     permission_classes = [EnginePermission]
+    query_budget = 4
 
     def retrieve(self, request, pk=None):
         module = get_object_or_404(Module, pk=pk)
@@ -105,6 +93,7 @@ class InstallModuleViewSet(viewsets.ViewSet):
 class UninstallModuleViewSet(viewsets.ViewSet):
     serializer_class = ModuleSerializer
     permission_classes = [EnginePermission]
+    query_budget = 4
 
     def retrieve(self, request, pk=None):
         module = get_object_or_404(Module, pk=pk)
@@ -127,6 +116,7 @@ class UninstallModuleViewSet(viewsets.ViewSet):
 class UpgradeModuleViewSet(viewsets.ViewSet):
     serializer_class = ModuleSerializer
     permission_classes = [EnginePermission]
+    query_budget = 4
 
     def retrieve(self, request, pk=None):
         module = get_object_or_404(Module, pk=pk)
@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.request import Request
+from configs.async_api import async_api_view
+from configs.pagination import KeysetPagination
+from configs.permissions import ModulePermission
+from configs.query_budget import query_budget
+from configs.utils import json_response, success_body, error_body, async_conditional_get, ndjson_stream, json_array_stream
+from configs.versions import atable_version
+from products.models import Product
+from products.serializers import ProductSerializer, product_reader
+
+EXPORT_OUTPUTS = {
+    "ndjson": (ndjson_stream, "application/x-ndjson"),
+    "json": (json_array_stream, "application/json"),
+}
+
+async def catalog_version(request, *args, **kwargs):
+    return await atable_version(Product.alive)
+
+
+@query_budget(4)
+@async_api_view(
+    permission_classes=[ModulePermission],
+    operation_id="get_product_by_id",
+    tags=["Product Services"],
+    description="Retrieve a specific product by ID (Login required).",
+    responses=ProductSerializer,
+)
+@async_conditional_get(catalog_version)
+async def retrieve_product(request, pk):
+    if not request.user.is_authenticated:
+        return json_response(error_body("Authentication required", 401), 401)
+
+    product = await product_reader.values(Product.alive.filter(pk=pk)).afirst()
+    if product is None:
+        return json_response(error_body("No Product matches the given query.", 404), 404)
+
+    return json_response(success_body(product_reader.to_representation(product), "Product retrieved successfully."))
+
+
+@query_budget(4)
+@async_api_view(
+    permission_classes=[ModulePermission],
+    operation_id="get_all_products",
+    tags=["Product Services"],
+    description="Retrieve all products (No authentication required).",
+    responses=ProductSerializer(many=True),
+)
+@async_conditional_get(catalog_version)
+async def all_products(request):
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(product_reader.values(Product.alive.all()), Request(request))
+    return json_response(success_body(
+        product_reader.serialize(page),
+        "All products retrieved successfully.",
+        pagination=paginator.get_pagination_meta()
+    ))
+
+
+# Async so that under ASGI the response streams chunk by chunk from a
+# server-side cursor; a sync iterator would be drained into a list first.
+@query_budget(3)
+@async_api_view(
+    permission_classes=[ModulePermission],
+    operation_id="export_products",
+    tags=["Product Services"],
+    description="Stream every product as NDJSON (default) or as a JSON array.",
+    parameters=[
+        OpenApiParameter("output", str, enum=list(EXPORT_OUTPUTS), description="Export format."),
+    ],
+)
+async def export_products(request):
+    output = request.GET.get("output", "ndjson")
+    if output not in EXPORT_OUTPUTS:
+        return json_response(error_body("Output must be one of: ndjson, json.", 400), 400)
+
+    stream, content_type = EXPORT_OUTPUTS[output]
+    products = product_reader.values(Product.alive.order_by("id")).aiterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    tz = timezone.get_current_timezone()
+    rows = (product_reader.to_representation(product, tz) async for product in products)
+
+    response = StreamingHttpResponse(stream(rows), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="products.{output}"'
+    return response
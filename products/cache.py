@@ -0,0 +1,14 @@
+from django.conf import settings
+from configs.cache import TTLCache
+
+# barcode -> (product id, pre-encoded JSON payload) of a live (not soft-deleted)
+# product, indexed by product id for eviction
+barcode_cache = TTLCache(settings.BARCODE_CACHE_SIZE, settings.BARCODE_CACHE_TTL, index=lambda entry: entry[0])
+
+
+def evict_product(product_id):
+    barcode_cache.delete_indexed(product_id)
+
+
+def evict_all_products():
+    barcode_cache.clear()
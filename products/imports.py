@@ -0,0 +1,237 @@
+import csv
+import os
+import tempfile
+from django.db import connection, transaction
+from django.utils import timezone
+from products.models import Product, ProductImportJob
+from products.cache import evict_all_products
+
+IMPORT_COLUMNS = ["product_name", "barcode", "price", "stock"]
+REQUIRED_COLUMNS = {"product_name", "barcode", "price"}
+MAX_REPORTED_ERRORS = 100
+COPY_BLOCK_SIZE = 64 * 1024
+
+STAGING_TABLE = "product_import_staging"
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMPORARY TABLE {STAGING_TABLE} (
+        row_index bigserial,
+        product_name text,
+        barcode text,
+        price text,
+        stock text,
+        error text
+    ) ON COMMIT DROP
+"""
+
+VALIDATE_SQL = rf"""
+    UPDATE {STAGING_TABLE} SET
+        product_name = btrim(product_name),
+        barcode = btrim(barcode),
+        price = btrim(price),
+        stock = NULLIF(btrim(stock), ''),
+        error = CASE
+            WHEN barcode IS NULL OR btrim(barcode) = '' THEN 'barcode is required'
+            WHEN length(btrim(barcode)) > 50 THEN 'barcode must be at most 50 characters'
+            WHEN product_name IS NULL OR btrim(product_name) = '' THEN 'product_name is required'
+            WHEN length(btrim(product_name)) > 255 THEN 'product_name must be at most 255 characters'
+            WHEN price IS NULL OR btrim(price) !~ '^-?\d{{1,8}}(\.\d{{1,2}})?$' THEN 'price must be a number with at most 8 digits and 2 decimal places'
+            WHEN NULLIF(btrim(stock), '') IS NOT NULL AND btrim(stock) !~ '^\d{{1,9}}$' THEN 'stock must be a non-negative integer'
+        END
+"""
+
+DEDUPLICATE_SQL = f"""
+    UPDATE {STAGING_TABLE} AS staging
+    SET error = 'duplicate barcode, a later row in the file wins'
+    FROM (
+        SELECT row_index AS duplicate_row,
+               row_number() OVER (PARTITION BY barcode ORDER BY row_index DESC) AS position
+        FROM {STAGING_TABLE}
+        WHERE error IS NULL
+    ) AS ranked
+    WHERE staging.row_index = ranked.duplicate_row AND ranked.position > 1
+"""
+
+COUNT_SQL = f"SELECT count(*), count(error) FROM {STAGING_TABLE}"
+
+ERRORS_SQL = f"""
+    SELECT row_index, barcode, error FROM {STAGING_TABLE}
+    WHERE error IS NOT NULL ORDER BY row_index LIMIT %s
+"""
+
+def merge_rows(stock_condition, update_stock):
+    stock = "stock = EXCLUDED.stock," if update_stock else ""
+    return f"""
+        INSERT INTO {Product._meta.db_table} (product_name, barcode, price, stock, created_at, updated_at, is_deleted)
+        SELECT product_name, barcode, price::numeric, COALESCE(stock::integer, 0), now(), now(), false
+        FROM {STAGING_TABLE}
+        WHERE error IS NULL AND {stock_condition}
+        ON CONFLICT (barcode) DO UPDATE SET
+            product_name = EXCLUDED.product_name,
+            price = EXCLUDED.price,
+            {stock}
+            updated_at = EXCLUDED.updated_at,
+            is_deleted = false,
+            deleted_at = NULL
+        RETURNING (xmax = 0) AS inserted
+    """
+
+
+# Rows with an empty stock cell keep the stock of an existing product, so they
+# are merged by their own INSERT that leaves the column alone on conflict.
+MERGE_SQL = f"""
+    WITH stocked AS ({merge_rows("stock IS NOT NULL", update_stock=True)}),
+    unstocked AS ({merge_rows("stock IS NULL", update_stock=False)}),
+    merged AS (SELECT inserted FROM stocked UNION ALL SELECT inserted FROM unstocked)
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged
+"""
+
+# pg_advisory_lock key of a running job, paired with the job id. The importer
+# holds it for the session, so a job whose lock is free has lost its worker.
+IMPORT_LOCK_KEY = 7301002
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def spool_upload(content):
+    """Write a job's CSV to a local temporary file for COPY to read."""
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".csv", delete=False) as destination:
+        destination.write(content)
+    return destination.name
+
+
+def read_columns(path):
+    with open(path, newline="", encoding="utf-8-sig") as source:
+        header = next(csv.reader(source), [])
+
+    columns = [column.strip().lower() for column in header]
+    missing = REQUIRED_COLUMNS - set(columns)
+    unknown = set(columns) - set(IMPORT_COLUMNS)
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(sorted(missing))}.")
+    if unknown:
+        raise ImportFileError(f"Unknown column(s): {', '.join(sorted(unknown))}.")
+    if len(columns) != len(set(columns)):
+        raise ImportFileError("Duplicate column names in header.")
+    return columns
+
+
+def copy_into_staging(cursor, path, columns):
+    sql = f"COPY {STAGING_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, HEADER true)"
+    raw_cursor = cursor.cursor
+
+    with open(path, "rb") as source:
+        if hasattr(raw_cursor, "copy"):
+            with raw_cursor.copy(sql) as copy:
+                while block := source.read(COPY_BLOCK_SIZE):
+                    copy.write(block)
+        else:
+            raw_cursor.copy_expert(sql, source, size=COPY_BLOCK_SIZE)
+
+
+def import_products(path):
+    """Load a CSV file into a staging table with COPY and merge it into the product table."""
+    columns = read_columns(path)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(CREATE_STAGING_SQL)
+        copy_into_staging(cursor, path, columns)
+        cursor.execute(VALIDATE_SQL)
+        cursor.execute(DEDUPLICATE_SQL)
+
+        cursor.execute(COUNT_SQL)
+        total_rows, error_count = cursor.fetchone()
+
+        cursor.execute(ERRORS_SQL, [MAX_REPORTED_ERRORS])
+        errors = [
+            {"row": row, "barcode": barcode, "error": error}
+            for row, barcode, error in cursor.fetchall()
+        ]
+
+        cursor.execute(MERGE_SQL)
+        created_count, updated_count = cursor.fetchone()
+
+    return {
+        "total_rows": total_rows,
+        "created_count": created_count,
+        "updated_count": updated_count,
+        "error_count": error_count,
+        "errors": errors,
+    }
+
+
+def advisory_lock(function, job_id):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {function}(%s, %s)", [IMPORT_LOCK_KEY, job_id])
+        return cursor.fetchone()[0]
+
+
+def remove_upload(path):
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def claim_job():
+    """Mark the oldest pending job running and lock it for this session; None when there is none."""
+    with transaction.atomic():
+        job = (
+            ProductImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ProductImportJob.STATUS_PENDING).order_by("id").first()
+        )
+        if job is None:
+            return None
+        advisory_lock("pg_advisory_lock", job.pk)
+        job.status = ProductImportJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def run_import(job):
+    jobs = ProductImportJob.objects.filter(pk=job.pk)
+    path = spool_upload(job.file)
+    try:
+        result = import_products(path)
+        evict_all_products()
+        jobs.update(
+            status=ProductImportJob.STATUS_COMPLETED,
+            message="Import finished.",
+            finished_at=timezone.now(),
+            file=b"",
+            **result
+        )
+    except Exception as e:
+        jobs.update(
+            status=ProductImportJob.STATUS_FAILED,
+            message=str(e),
+            finished_at=timezone.now(),
+            file=b""
+        )
+    finally:
+        remove_upload(path)
+        advisory_lock("pg_advisory_unlock", job.pk)
+
+
+def fail_abandoned_jobs():
+    """Fail running jobs whose importer stopped (crash, deploy, restart) before finishing them."""
+    failed = 0
+    for job in ProductImportJob.objects.filter(status=ProductImportJob.STATUS_RUNNING).only("id"):
+        if not advisory_lock("pg_try_advisory_lock", job.pk):
+            continue
+        try:
+            failed += ProductImportJob.objects.filter(pk=job.pk, status=ProductImportJob.STATUS_RUNNING).update(
+                status=ProductImportJob.STATUS_FAILED,
+                message="The import worker stopped before the job finished; upload the file again.",
+                finished_at=timezone.now(),
+                file=b""
+            )
+        finally:
+            advisory_lock("pg_advisory_unlock", job.pk)
+    return failed
+
+
+def start_import(upload):
+    """Queue an upload for the importer process (`manage.py run_imports`)."""
+    return ProductImportJob.objects.create(file_name=upload.name[:255], file=b"".join(upload.chunks()))
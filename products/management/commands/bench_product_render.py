@@ -0,0 +1,68 @@
+import json
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from configs.renderers import ORJSONRenderer
+from products.models import Product
+from products.serializers import ProductSerializer, product_reader
+
+
+class Command(BaseCommand):
+    help = "Benchmark serializing and rendering a /products/get/all response page."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Products per page.")
+        parser.add_argument("--repeat", type=int, default=50, help="Renders per renderer.")
+
+    def build_products(self, rows):
+        now = timezone.now()
+        return [
+            Product(
+                id=index, product_name=f"Product {index}", barcode=f"{index:013d}",
+                price=Decimal("1999.99") + index, stock=index % 500,
+                created_at=now, updated_at=now,
+            )
+            for index in range(1, rows + 1)
+        ]
+
+    def build_page(self, data):
+        return {
+            "data": data,
+            "status": "success",
+            "code": 200,
+            "messages": "Products retrieved successfully.",
+            "pagination": {"next": None, "previous": None, "limit": len(data)},
+        }
+
+    def time_call(self, func, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            output = func()
+        return (time.perf_counter() - started) / repeat, output
+
+    def report(self, label, baseline, fast):
+        self.stdout.write(f"{label}: {baseline * 1000:.2f} ms -> {fast * 1000:.2f} ms per page ({baseline / fast:.1f}x)")
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        products = self.build_products(options["rows"])
+        columns = product_reader.compile()[0]
+        rows = [{column: getattr(product, column) for column in columns} for product in products]
+
+        baseline, expected = self.time_call(lambda: ProductSerializer(products, many=True).data, repeat)
+        fast, data = self.time_call(lambda: product_reader.serialize(rows), repeat)
+        if list(expected) != data:
+            self.stderr.write(self.style.ERROR("Serializer outputs differ."))
+            return
+        self.report("Serialize (ProductSerializer -> ValuesReader)", baseline, fast)
+
+        body = self.build_page(data)
+        baseline, expected = self.time_call(lambda: JSONRenderer().render(body), repeat)
+        fast, output = self.time_call(lambda: ORJSONRenderer().render(body), repeat)
+        if json.loads(expected) != json.loads(output):
+            self.stderr.write(self.style.ERROR("Renderer outputs differ."))
+            return
+        self.report("Render (JSONRenderer -> ORJSONRenderer)", baseline, fast)
+        self.stdout.write(f"rows={len(data)} bytes={len(output)}")
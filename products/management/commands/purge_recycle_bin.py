@@ -0,0 +1,80 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from products.models import Product
+
+# pg_advisory_lock key shared by every node running this command.
+PURGE_LOCK_KEY = 7301001
+
+
+class Command(BaseCommand):
+    help = "Permanently delete products that have been in the recycle bin longer than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-hours", type=int, default=settings.RECYCLE_BIN_RETENTION_HOURS,
+            help="Delete products recycled more than this many hours ago.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.PURGE_BATCH_SIZE,
+            help="Rows deleted per statement.",
+        )
+        parser.add_argument(
+            "--pause", type=float, default=0.0,
+            help="Seconds to sleep between batches.",
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep running, purging every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval", type=int, default=settings.PURGE_INTERVAL,
+            help="Seconds between purge runs when --loop is set.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                self.run_once(options)
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Purge worker stopped.")
+
+    def run_once(self, options):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [PURGE_LOCK_KEY])
+            if not cursor.fetchone()[0]:
+                self.stdout.write("Another node is purging the recycle bin, skipping this run.")
+                return
+
+        try:
+            self.purge(options)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [PURGE_LOCK_KEY])
+
+    def purge(self, options):
+        threshold = timezone.now() - timedelta(hours=options["retention_hours"])
+        started = time.monotonic()
+        deleted = batches = 0
+
+        while True:
+            batch_started = time.monotonic()
+            count = Product.purge_recycled_batch(threshold, options["batch_size"])
+            if not count:
+                break
+
+            deleted += count
+            batches += 1
+            self.stdout.write(f"Batch {batches}: purged {count} product(s) in {time.monotonic() - batch_started:.3f}s.")
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {deleted} product(s) in {batches} batch(es) in {time.monotonic() - started:.3f}s."
+        ))
@@ -0,0 +1,39 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from products.imports import claim_job, fail_abandoned_jobs, run_import
+
+
+class Command(BaseCommand):
+    help = "Run pending product CSV imports; any number of these workers can share the queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep running, polling for pending jobs every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=settings.IMPORT_POLL_INTERVAL,
+            help="Seconds between polls when --loop is set and the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                self.run_once()
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Import worker stopped.")
+
+    def run_once(self):
+        failed = fail_abandoned_jobs()
+        if failed:
+            self.stdout.write(self.style.WARNING(f"Failed {failed} import job(s) abandoned by a stopped worker."))
+
+        while job := claim_job():
+            started = time.monotonic()
+            run_import(job)
+            job.refresh_from_db(fields=["status", "message"])
+            self.stdout.write(f"Job {job.pk} {job.status} in {time.monotonic() - started:.3f}s: {job.message}")
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_import_job'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('product_name', config='simple'), name='product_name_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['product_name'], name='product_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
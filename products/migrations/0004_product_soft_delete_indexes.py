@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['id'], name='product_alive_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['updated_at'], name='product_alive_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='product_recycled_deleted_idx'),
+        ),
+    ]
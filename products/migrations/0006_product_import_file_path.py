@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_table_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productimportjob',
+            name='file_path',
+            field=models.CharField(blank=True, default='', max_length=1024),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_import_file_path'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "DROP TRIGGER tabel_product_data_version ON tabel_product_data;",
+            "CREATE TRIGGER tabel_product_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+            "ON tabel_product_data FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();",
+        ),
+    ]
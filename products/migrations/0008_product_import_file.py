@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:41
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fail_spooled_jobs(apps, schema_editor):
+    # Their files were spooled on the web process's disk, which the importer may not see.
+    ProductImportJob = apps.get_model("products", "ProductImportJob")
+    ProductImportJob.objects.filter(status="pending").update(
+        status="failed",
+        message="The upload was not kept across the upgrade; upload the file again.",
+        finished_at=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_drop_product_table_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_spooled_jobs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='productimportjob',
+            name='file_path',
+        ),
+        migrations.AddField(
+            model_name='productimportjob',
+            name='file',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
@@ -1,7 +1,29 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.conf import settings
+from django.db import models, connection, transaction
 from django.utils.timezone import now
 from datetime import timedelta
 
+# Text search configuration for product names; "simple" does no stemming, so it
+# behaves the same for every language in the catalog.
+SEARCH_CONFIG = "simple"
+
+class ProductQuerySet(models.QuerySet):
+    def alive(self):
+        return self.filter(is_deleted=False)
+
+    def recycled(self):
+        return self.filter(is_deleted=True)
+
+class AliveProductManager(models.Manager.from_queryset(ProductQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+class RecycledProductManager(models.Manager.from_queryset(ProductQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().recycled()
+
 class Product(models.Model):
     product_name = models.CharField(max_length=255)
     barcode = models.CharField(max_length=50, unique=True)
@@ -12,8 +34,20 @@ class Product(models.Model):
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    # objects sees every row; alive is the live catalog and recycled the recycle bin.
+    objects = models.Manager.from_queryset(ProductQuerySet)()
+    alive = AliveProductManager()
+    recycled = RecycledProductManager()
+
     class Meta:
         db_table = "tabel_product_data"
+        indexes = [
+            GinIndex(SearchVector("product_name", config=SEARCH_CONFIG), name="product_name_search_idx"),
+            GinIndex(fields=["product_name"], opclasses=["gin_trgm_ops"], name="product_name_trgm_idx"),
+            models.Index(fields=["id"], condition=models.Q(is_deleted=False), name="product_alive_id_idx"),
+            models.Index(fields=["updated_at"], condition=models.Q(is_deleted=False), name="product_alive_updated_idx"),
+            models.Index(fields=["deleted_at"], condition=models.Q(is_deleted=True), name="product_recycled_deleted_idx"),
+        ]
 
     def __str__(self):
         return self.product_name
@@ -28,7 +62,120 @@ class Product(models.Model):
         self.deleted_at = None
         self.save()
 
+    @staticmethod
+    def purge_recycled_batch(threshold, batch_size):
+        """Permanently delete up to batch_size products recycled before threshold; returns the count."""
+        with connection.cursor() as cursor:
+            cursor.execute(PURGE_RECYCLED_SQL, [threshold, batch_size])
+            return cursor.rowcount
+
     @staticmethod
     def permanent_delete_old():
-        threshold = now() - timedelta(hours=24)
-        Product.objects.filter(is_deleted=True, deleted_at__lte=threshold).delete()
+        threshold = now() - timedelta(hours=settings.RECYCLE_BIN_RETENTION_HOURS)
+        deleted = 0
+        while count := Product.purge_recycled_batch(threshold, settings.PURGE_BATCH_SIZE):
+            deleted += count
+        return deleted
+
+    @staticmethod
+    def upsert(rows):
+        """Insert or update products by barcode, reviving recycled ones; {barcode: (id, created)}.
+
+        Rows without a stock key keep the stored stock (0 for new products).
+        """
+        timestamp = now()
+        saved = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(rows), settings.BULK_BATCH_SIZE):
+                batch = rows[start:start + settings.BULK_BATCH_SIZE]
+                columns = [[row[field] for row in batch] for field in ("product_name", "barcode", "price")]
+                stock = [row.get("stock", 0) for row in batch]
+                has_stock = ["stock" in row for row in batch]
+                cursor.execute(UPSERT_SQL, [*columns, stock, has_stock, timestamp, timestamp])
+                saved.update((barcode, (product_id, created)) for barcode, product_id, created in cursor.fetchall())
+        return saved
+
+    @staticmethod
+    def adjust_stock(product_id, delta):
+        """Add delta to a live product's stock in one statement; None if missing or it would go negative."""
+        with connection.cursor() as cursor:
+            cursor.execute(ADJUST_STOCK_SQL, [delta, now(), product_id, delta])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+
+ADJUST_STOCK_SQL = f"""
+    UPDATE {Product._meta.db_table}
+    SET stock = stock + %s, updated_at = %s
+    WHERE id = %s AND is_deleted = false AND stock + %s >= 0
+    RETURNING stock
+"""
+
+# (xmax = 0) tells a fresh insert from a conflict update, whatever other writers did meanwhile.
+# Rows sent without a stock (has_stock false) keep the stock already stored.
+UPSERT_SQL = f"""
+    WITH rows AS (
+        SELECT * FROM unnest(%s::varchar[], %s::varchar[], %s::numeric[], %s::integer[], %s::boolean[])
+            AS rows(product_name, barcode, price, stock, has_stock)
+    )
+    INSERT INTO {Product._meta.db_table}
+        (product_name, barcode, price, stock, created_at, updated_at, is_deleted, deleted_at)
+    SELECT product_name, barcode, price, stock, %s, %s, false, NULL
+    FROM rows
+    ON CONFLICT (barcode) DO UPDATE SET
+        product_name = EXCLUDED.product_name,
+        price = EXCLUDED.price,
+        stock = CASE
+            WHEN (SELECT has_stock FROM rows WHERE rows.barcode = EXCLUDED.barcode) THEN EXCLUDED.stock
+            ELSE {Product._meta.db_table}.stock
+        END,
+        updated_at = EXCLUDED.updated_at,
+        is_deleted = false,
+        deleted_at = NULL
+    RETURNING barcode, id, (xmax = 0)
+"""
+
+PURGE_RECYCLED_SQL = f"""
+    DELETE FROM {Product._meta.db_table}
+    WHERE id IN (
+        SELECT id FROM {Product._meta.db_table}
+        WHERE is_deleted = true AND deleted_at <= %s
+        ORDER BY deleted_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+
+class ProductImportJob(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    file_name = models.CharField(max_length=255)
+    # The uploaded CSV lives in the row so the separate importer process can
+    # read it; emptied once the job finishes
+    file = models.BinaryField(default=b"")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "tabel_product_import_data"
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
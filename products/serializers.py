@@ -1,8 +1,50 @@
 from rest_framework import serializers
-from products.models import Product
+from products.models import Product, ProductImportJob
+from configs.readers import ValuesReader
+
+# Largest value of the stock column (PostgreSQL integer)
+MAX_STOCK = 2**31 - 1
 
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ["id", "product_name", "barcode", "price", "stock", "is_deleted", "deleted_at", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at", "deleted_at"]
+
+
+product_reader = ValuesReader(ProductSerializer)
+
+
+class ProductUpsertSerializer(ProductSerializer):
+    """Validates one row of a bulk upsert; barcode uniqueness is resolved by the upsert itself."""
+
+    class Meta(ProductSerializer.Meta):
+        read_only_fields = ProductSerializer.Meta.read_only_fields + ["is_deleted"]
+        extra_kwargs = {"barcode": {"validators": []}}
+
+
+class ProductImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductImportJob
+        fields = [
+            "id", "file_name", "status", "total_rows", "created_count", "updated_count",
+            "error_count", "errors", "message", "created_at", "started_at", "finished_at"
+        ]
+        read_only_fields = fields
+
+
+class ProductImportUploadSerializer(serializers.Serializer):
+    file = serializers.FileField()
+
+
+class StockAdjustmentSerializer(serializers.Serializer):
+    quantity = serializers.IntegerField(min_value=1, max_value=MAX_STOCK)
+
+
+class StockBatchItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    delta = serializers.IntegerField(min_value=-MAX_STOCK, max_value=MAX_STOCK)
+
+
+class StockBatchSerializer(serializers.Serializer):
+    items = serializers.ListField(child=StockBatchItemSerializer(), allow_empty=False)
@@ -0,0 +1,8 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from products.models import Product
+from products.cache import evict_product
+
+@receiver(post_save, sender=Product)
+def evict_cached_product(sender, instance, **kwargs):
+    evict_product(instance.pk)
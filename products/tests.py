@@ -0,0 +1,75 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from configs.models import User, Role, UserRole
+from engines.models import Module
+from engines.state import invalidate_module_state
+from products.models import Product
+from products.serializers import MAX_STOCK
+
+TOKEN = "stock-token"
+
+
+class StockBoundsTests(TestCase):
+    """Stock changes past the integer column come back as 400s, not database errors."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="stock", email="stock@example.com", password="!", token=TOKEN)
+        UserRole.objects.create(user=user, role=Role.objects.get(rolename="administrator"))
+        Module.objects.filter(name="products").update(installed=True)
+        cls.product = Product.objects.create(product_name="Stocked", barcode="stock-1", price="1.00", stock=MAX_STOCK - 1)
+
+    def setUp(self):
+        invalidate_module_state()
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Token {TOKEN}"
+
+    def post(self, name, payload, *args):
+        return self.client.post(reverse(name, args=args), payload, content_type="application/json")
+
+    def assertStockUnchanged(self):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock, MAX_STOCK - 1)
+
+    def test_quantity_above_integer_range(self):
+        response = self.post("products:stock-product-increment", {"quantity": MAX_STOCK + 1}, self.product.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertStockUnchanged()
+
+    def test_delta_outside_integer_range(self):
+        for delta in (MAX_STOCK + 1, -MAX_STOCK - 1):
+            response = self.post("products:stock-product-batch", {"items": [{"id": self.product.pk, "delta": delta}]})
+            self.assertEqual(response.status_code, 400)
+        self.assertStockUnchanged()
+
+    def test_increment_overflow(self):
+        response = self.post("products:stock-product-increment", {"quantity": 2}, self.product.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["status"], "error")
+
+    def test_batch_overflow(self):
+        items = [{"id": self.product.pk, "delta": MAX_STOCK}, {"id": self.product.pk, "delta": MAX_STOCK}]
+        response = self.post("products:stock-product-batch", {"items": items})
+        self.assertEqual(response.status_code, 400)
+        self.assertStockUnchanged()
+
+
+class UpsertTests(TestCase):
+    """Product.upsert keeps stored stock for rows that leave it out and writes in BULK_BATCH_SIZE chunks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = Product.objects.create(product_name="Kept", barcode="upsert-1", price="1.00", stock=7)
+
+    @override_settings(BULK_BATCH_SIZE=2)
+    def test_missing_stock_keeps_stored_stock(self):
+        rows = [
+            {"product_name": "Renamed", "barcode": "upsert-1", "price": "2.00"},
+            {"product_name": "New", "barcode": "upsert-2", "price": "1.00"},
+            {"product_name": "Stocked", "barcode": "upsert-3", "price": "1.00", "stock": 4},
+        ]
+        with self.assertNumQueries(4):
+            saved = Product.upsert(rows)
+
+        self.assertEqual(saved["upsert-1"], (self.product.pk, False))
+        stock = dict(Product.objects.filter(barcode__startswith="upsert-").values_list("barcode", "stock"))
+        self.assertEqual(stock, {"upsert-1": 7, "upsert-2": 0, "upsert-3": 4})
@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from products import async_views
 from products.views import (
     GetProductViewSet, CreateProductViewSet, UpdateProductViewSet,
-    DeleteProductViewSet, PermanentDeleteProductViewSet, RestoreProductViewSet
+    DeleteProductViewSet, PermanentDeleteProductViewSet, RestoreProductViewSet,
+    ImportProductViewSet, StockProductViewSet
 )
 
 router = DefaultRouter(trailing_slash=False)
@@ -12,7 +14,13 @@ router.register(r'products/update', UpdateProductViewSet, basename='update-produ
 router.register(r'products/delete', DeleteProductViewSet, basename='delete-product')
 router.register(r'products/destroy', PermanentDeleteProductViewSet, basename='delete-permanent')
 router.register(r'products/restore', RestoreProductViewSet, basename='restore-product')
+router.register(r'products/import', ImportProductViewSet, basename='import-product')
+router.register(r'products/stock', StockProductViewSet, basename='stock-product')
 
+# Async reads; configs.schema.SchemaGenerator documents them from their async_api_view arguments.
 products_urlpatterns = [
+    path('products/get/all', async_views.all_products, name='async-get-products-all'),
+    path('products/get/<int:pk>', async_views.retrieve_product, name='async-get-product'),
+    path('products/get/export', async_views.export_products, name='async-get-products-export'),
     path('', include(router.urls)),
 ]
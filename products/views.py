@@ -1,20 +1,34 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db import transaction
 from django.utils import timezone
 from django.shortcuts import get_object_or_404, render
 from rest_framework import viewsets, mixins, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser
 from rest_framework.decorators import action
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from products.models import Product
-from products.serializers import ProductSerializer
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from products.models import Product, ProductImportJob, SEARCH_CONFIG
+from products.serializers import (
+    ProductSerializer, product_reader, ProductUpsertSerializer, ProductImportJobSerializer, ProductImportUploadSerializer,
+    StockAdjustmentSerializer, StockBatchSerializer
+)
+from products.imports import start_import
+from products.cache import barcode_cache, evict_product, evict_all_products
 from configs.permissions import ModulePermission
-from configs.utils import success_response, error_response
-from datetime import timedelta
+from configs.pagination import RankedPagination
+from configs.renderers import json_fragment
+from configs.utils import success_response, error_response, conditional_get
+from collections import defaultdict
 
 # PRODUCT SERVICE START
 
+SEARCH_MAX_LENGTH = 100
+
 def product_page(request):
-    products = Product.objects.filter(is_deleted=False)
+    products = Product.alive.all()
     user_groups = list(request.user.groups.values_list("name", flat=True)) if request.user.is_authenticated else []
     
     return render(request, "installed.html", {
@@ -24,38 +38,74 @@ def product_page(request):
     })
 
 # GET PRODUCTS
-@extend_schema_view(
-    retrieve=extend_schema(
-        operation_id="get_product_by_id",
-        tags=["Product Services"],
-        description="Retrieve a specific product by ID (Login required).",
-    ),
-)
-class GetProductViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+# Detail, list and export reads are served by products.async_views.
+class GetProductViewSet(viewsets.GenericViewSet):
     serializer_class = ProductSerializer
     permission_classes = [ModulePermission]
+    query_budget = 3
 
     def get_queryset(self):
-        return Product.objects.all()
+        return Product.alive.all()
 
-    def retrieve(self, request, *args, **kwargs):
+    @extend_schema(
+        operation_id="get_product_by_barcode",
+        tags=["Product Services"],
+        description="Retrieve a product by its barcode (Login required).",
+    )
+    @action(detail=False, methods=["get"], url_path=r"barcode/(?P<barcode>[^/]+)")
+    def barcode(self, request, barcode=None):
         if not request.user.is_authenticated:
             return error_response("Authentication required", code=status.HTTP_401_UNAUTHORIZED)
 
-        product = get_object_or_404(self.get_queryset(), pk=kwargs["pk"])
-        serializer = self.get_serializer(product)
-        return success_response(serializer.data, "Product retrieved successfully.")
+        entry = barcode_cache.get(barcode)
+        if entry is None:
+            product = self.get_queryset().filter(barcode=barcode).first()
+            if not product:
+                return error_response("Product not found", code=status.HTTP_404_NOT_FOUND)
+
+            entry = (product.pk, json_fragment(self.get_serializer(product).data))
+            barcode_cache.set(barcode, entry)
+
+        return success_response(entry[1], "Product retrieved successfully.")
 
     @extend_schema(
-        operation_id="get_all_products",
+        operation_id="search_products",
         tags=["Product Services"],
-        description="Retrieve all products (No authentication required).",
+        description="Search live products by name (ranked full-text and fuzzy match) or barcode prefix.",
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Search term."),
+            OpenApiParameter("limit", int, description="Results per page."),
+            OpenApiParameter("offset", int, description="Results to skip."),
+        ],
     )
     @action(detail=False, methods=["get"])
-    def all(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(serializer.data, "All products retrieved successfully.")
+    def search(self, request):
+        term = request.query_params.get("q", "").strip()[:SEARCH_MAX_LENGTH]
+        if not term:
+            return error_response("Query parameter 'q' is required.", code=status.HTTP_400_BAD_REQUEST)
+
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+        barcode_boost = Case(
+            When(barcode=term, then=Value(2.0)),
+            When(barcode__startswith=term, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        queryset = (
+            self.get_queryset()
+            .annotate(document=SearchVector("product_name", config=SEARCH_CONFIG))
+            .filter(Q(document=query) | Q(product_name__trigram_similar=term) | Q(barcode__startswith=term))
+            .annotate(rank=SearchRank(F("document"), query) + TrigramSimilarity("product_name", term) + barcode_boost)
+            .order_by("-rank", "id")
+        )
+
+        paginator = RankedPagination()
+        page = paginator.paginate_queryset(product_reader.values(queryset), request, view=self)
+        return success_response(
+            product_reader.serialize(page),
+            "Products retrieved successfully.",
+            pagination=paginator.get_pagination_meta()
+        )
 
 # CREATE PRODUCT
 @extend_schema_view(
@@ -76,6 +126,54 @@ class CreateProductViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
             return success_response(serializer.data, "Product created successfully.", code=status.HTTP_201_CREATED)
         return error_response(serializer.errors, code=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        operation_id="bulk_upsert_products",
+        tags=["Product Services"],
+        description="Create or update many products at once, matched by barcode.",
+        request=ProductUpsertSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return error_response("Request body must be a non-empty list of products.", code=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.BULK_MAX_ROWS:
+            return error_response(f"At most {settings.BULK_MAX_ROWS} products per request.", code=status.HTTP_400_BAD_REQUEST)
+
+        results = []
+        products = {}
+        for index, row in enumerate(rows):
+            serializer = ProductUpsertSerializer(data=row)
+            if not serializer.is_valid():
+                results.append({"index": index, "status": "error", "errors": serializer.errors})
+                continue
+
+            barcode = serializer.validated_data["barcode"]
+            if barcode in products:
+                results.append({"index": index, "status": "error", "errors": {"barcode": ["Duplicate barcode in request."]}})
+                continue
+
+            products[barcode] = serializer.validated_data
+            results.append({"index": index, "barcode": barcode})
+
+        if not products:
+            return error_response("No valid products to save.", code=status.HTTP_400_BAD_REQUEST, data=results)
+
+        saved = Product.upsert(list(products.values()))
+        evict_all_products()
+
+        counts = {"created": 0, "updated": 0, "error": 0}
+        for result in results:
+            if "barcode" in result:
+                result["id"], created = saved[result["barcode"]]
+                result["status"] = "created" if created else "updated"
+            counts[result["status"]] += 1
+
+        return success_response(
+            results,
+            f"{counts['created']} product(s) created, {counts['updated']} updated, {counts['error']} failed."
+        )
+
 
 # UPDATE PRODUCT
 @extend_schema_view(
@@ -86,7 +184,7 @@ class CreateProductViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     ),
 )
 class UpdateProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.filter(is_deleted=False)
+    queryset = Product.alive.all()
     serializer_class = ProductSerializer
     permission_classes = [ModulePermission]
     http_method_names = ["put"]
@@ -100,6 +198,85 @@ class UpdateProductViewSet(viewsets.ModelViewSet):
             return success_response(serializer.data, "Product updated successfully.")
         return error_response(serializer.errors, code=status.HTTP_400_BAD_REQUEST)
 
+# ADJUST STOCK
+class StockProductViewSet(viewsets.GenericViewSet):
+    queryset = Product.alive.all()
+    serializer_class = StockAdjustmentSerializer
+    permission_classes = [IsAuthenticated, ModulePermission]
+    lookup_value_regex = r"[0-9]+"
+
+    def adjustment_failed(self, product_id):
+        if not self.get_queryset().filter(pk=product_id).exists():
+            return error_response(f"Product {product_id} not found.", code=status.HTTP_404_NOT_FOUND)
+        return error_response(f"Insufficient stock for product {product_id}.", code=status.HTTP_409_CONFLICT)
+
+    def adjust(self, request, pk, sign):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(serializer.errors, code=status.HTTP_400_BAD_REQUEST)
+
+        product_id = int(pk)
+        stock = Product.adjust_stock(product_id, sign * serializer.validated_data["quantity"])
+        if stock is None:
+            return self.adjustment_failed(product_id)
+
+        evict_product(product_id)
+        return success_response({"id": product_id, "stock": stock}, "Stock updated successfully.")
+
+    @extend_schema(
+        operation_id="increment_product_stock",
+        tags=["Product Services"],
+        description="Atomically add quantity to a product's stock.",
+    )
+    @action(detail=True, methods=["post"])
+    def increment(self, request, pk=None):
+        return self.adjust(request, pk, 1)
+
+    @extend_schema(
+        operation_id="decrement_product_stock",
+        tags=["Product Services"],
+        description="Atomically remove quantity from a product's stock, failing if not enough is left.",
+    )
+    @action(detail=True, methods=["post"])
+    def decrement(self, request, pk=None):
+        return self.adjust(request, pk, -1)
+
+    @extend_schema(
+        operation_id="batch_adjust_product_stock",
+        tags=["Product Services"],
+        description="Apply stock deltas to several products; either all succeed or none are applied.",
+        request=StockBatchSerializer,
+    )
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        serializer = StockBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(serializer.errors, code=status.HTTP_400_BAD_REQUEST)
+
+        deltas = defaultdict(int)
+        for item in serializer.validated_data["items"]:
+            deltas[item["id"]] += item["delta"]
+
+        # Lock rows in id order so concurrent batches cannot deadlock each other.
+        results = []
+        failed_id = None
+        with transaction.atomic():
+            for product_id in sorted(deltas):
+                stock = Product.adjust_stock(product_id, deltas[product_id])
+                if stock is None:
+                    failed_id = product_id
+                    transaction.set_rollback(True)
+                    break
+                results.append({"id": product_id, "stock": stock})
+
+        if failed_id is not None:
+            return self.adjustment_failed(failed_id)
+
+        for result in results:
+            evict_product(result["id"])
+        return success_response(results, f"Stock updated for {len(results)} product(s).")
+
+
 # DELETE PRODUCTS (Soft Delete)
 @extend_schema_view(
     destroy=extend_schema(
@@ -109,12 +286,12 @@ class UpdateProductViewSet(viewsets.ModelViewSet):
     ),
 )
 class DeleteProductViewSet(mixins.DestroyModelMixin, viewsets.GenericViewSet):
-    queryset = Product.objects.all()
+    queryset = Product.alive.all()
     serializer_class = ProductSerializer
     permission_classes = [ModulePermission]
 
     def destroy(self, request, *args, **kwargs):
-        product = get_object_or_404(Product, pk=kwargs["pk"], is_deleted=False)
+        product = get_object_or_404(Product.alive, pk=kwargs["pk"])
         product.is_deleted = True
         product.deleted_at = timezone.now()
         product.save()
@@ -127,9 +304,11 @@ class DeleteProductViewSet(mixins.DestroyModelMixin, viewsets.GenericViewSet):
     )
     @action(methods=["delete"], detail=False)
     def all(self, request):
-        updated_count = Product.objects.filter(is_deleted=False).update(
-            is_deleted=True, deleted_at=timezone.now()
+        now = timezone.now()
+        updated_count = Product.alive.update(
+            is_deleted=True, deleted_at=now, updated_at=now
         )
+        evict_all_products()
         if updated_count == 0:
             return error_response("No products found to move to recycle bin.", code=status.HTTP_404_NOT_FOUND)
 
@@ -146,11 +325,13 @@ class DeleteProductViewSet(mixins.DestroyModelMixin, viewsets.GenericViewSet):
 )
 class PermanentDeleteProductViewSet(viewsets.GenericViewSet, mixins.DestroyModelMixin):
     permission_classes = [ModulePermission]
-    queryset = Product.objects.filter(is_deleted=True)
+    queryset = Product.recycled.all()
 
     def destroy(self, request, pk=None):
         product = get_object_or_404(self.queryset, pk=pk)
+        product_id = product.pk
         product.delete()
+        evict_product(product_id)
         return success_response(None, "Product permanently deleted.")
 
     @extend_schema(
@@ -161,6 +342,7 @@ class PermanentDeleteProductViewSet(viewsets.GenericViewSet, mixins.DestroyModel
     @action(detail=False, methods=["delete"])
     def all(self, request):
         deleted_count, _ = self.queryset.delete()
+        evict_all_products()
 
         if deleted_count == 0:
             return error_response("No products found in recycle bin to delete.", code=status.HTTP_404_NOT_FOUND)
@@ -175,7 +357,7 @@ class PermanentDeleteProductViewSet(viewsets.GenericViewSet, mixins.DestroyModel
     ),
 )
 class RestoreProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.filter(is_deleted=True)
+    queryset = Product.recycled.all()
     serializer_class = ProductSerializer
     permission_classes = [ModulePermission]
     http_method_names = ["put"]
@@ -196,7 +378,8 @@ class RestoreProductViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["put"], url_path="all")
     def restore_all(self, request):
         """Restore all products by setting is_deleted to False."""
-        updated_count = self.queryset.update(is_deleted=False, deleted_at=None)
+        updated_count = self.queryset.update(is_deleted=False, deleted_at=None, updated_at=timezone.now())
+        evict_all_products()
 
         if updated_count == 0:
             return error_response("No products found in recycle bin to restore.", code=status.HTTP_404_NOT_FOUND)
@@ -205,7 +388,43 @@ class RestoreProductViewSet(viewsets.ModelViewSet):
 
 
 
-# CLEANUP SCHEDULER: Auto-delete recycle after 24 hours
+# IMPORT PRODUCTS (CSV)
+@extend_schema_view(
+    create=extend_schema(
+        operation_id="import_products",
+        tags=["Product Services"],
+        description="Upload a CSV file (product_name, barcode, price, stock) to import in the background.",
+        request={"multipart/form-data": ProductImportUploadSerializer},
+    ),
+    retrieve=extend_schema(
+        operation_id="get_product_import_by_id",
+        tags=["Product Services"],
+        description="Retrieve the status of a product import job.",
+    ),
+)
+class ImportProductViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = ProductImportJob.objects.defer("file")
+    serializer_class = ProductImportJobSerializer
+    permission_classes = [IsAuthenticated, ModulePermission]
+    parser_classes = [MultiPartParser]
+    query_budget = 3
+
+    def create(self, request, *args, **kwargs):
+        upload = ProductImportUploadSerializer(data=request.data)
+        if not upload.is_valid():
+            return error_response(upload.errors, code=status.HTTP_400_BAD_REQUEST)
+
+        job = start_import(upload.validated_data["file"])
+        serializer = self.get_serializer(job)
+        return success_response(serializer.data, "Product import queued.", code=status.HTTP_202_ACCEPTED)
+
+    def retrieve(self, request, *args, **kwargs):
+        job = get_object_or_404(self.get_queryset(), pk=kwargs["pk"])
+        serializer = self.get_serializer(job)
+        return success_response(serializer.data, "Product import retrieved successfully.")
+
+
+# CLEANUP SCHEDULER: Auto-delete recycle after RECYCLE_BIN_RETENTION_HOURS
+# (run continuously with `manage.py purge_recycle_bin --loop`)
 def cleanup_recycle_bin():
-    threshold = timezone.now() - timedelta(hours=24)
-    Product.objects.filter(is_deleted=True, deleted_at__lte=threshold).delete()
+    return Product.permanent_delete_old()